@@ -0,0 +1,82 @@
+"""
+Başlık çevirisi sözlük/cache hızlı yolu için benchmark aracı.
+Örnek bir başlık günlüğünü sırayla tekrar oynatır; birebir cache ve sözlük
+isabet oranını, LLM'e giden çağrı sayısını ve kazanılan tahmini gecikmeyi raporlar.
+LLM çağrısı yapılmaz; kaçırılan başlıklar çevrilmiş kabul edilip cache'e yazılır.
+
+Örnek:
+    python benchmark_glossary.py data/sample_title_log.txt --llm-latency-ms 800
+    python benchmark_glossary.py export.jsonl  # export çıktısındaki title_en alanları
+"""
+import argparse
+import json
+import sys
+import time
+from collections import Counter
+from typing import List
+
+from config import GLOSSARY_PATH
+from services.glossary_service import MedicalGlossary
+
+
+def read_titles(path: str) -> List[str]:
+    """Düz metin (satır başına bir başlık) veya JSONL (title_en / title alanı) oku."""
+    titles = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                record = json.loads(line)
+                line = record.get("title_en") or record.get("title") or ""
+            if line:
+                titles.append(line)
+    return titles
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Başlık çevirisi sözlük hızlı yolu benchmark'ı")
+    parser.add_argument("log", help="Başlık günlüğü (.txt veya .jsonl)")
+    parser.add_argument("--glossary", default=GLOSSARY_PATH, help="Sözlük dosyası")
+    parser.add_argument("--llm-latency-ms", type=float, default=800, help="Bir başlık çevirisi LLM çağrısının ortalama süresi")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    titles = read_titles(args.log)
+    if not titles:
+        print("Hata: Günlükte başlık bulunamadı", file=sys.stderr)
+        return 1
+
+    glossary = MedicalGlossary.load(args.glossary)
+    sources = Counter()
+    started = time.perf_counter()
+    for title in titles:
+        translation, source = glossary.fast_translate(title)
+        sources[source] += 1
+        if translation is None:
+            # LLM çevirisi yerine geçer; sonraki tekrarlar cache'ten döner
+            glossary.remember(title, f"<llm> {title}")
+    fast_path_ms = (time.perf_counter() - started) * 1000
+
+    total = len(titles)
+    hits = sources["cache"] + sources["glossary"]
+    saved_ms = hits * args.llm_latency_ms
+    baseline_ms = total * args.llm_latency_ms
+
+    print(f"Sözlük terimi:        {len(glossary.terms)}")
+    print(f"Başlık:               {total}")
+    print(f"Cache isabeti:        {sources['cache']} ({sources['cache'] / total:.1%})")
+    print(f"Sözlük isabeti:       {sources['glossary']} ({sources['glossary'] / total:.1%})")
+    print(f"Toplam isabet oranı:  {hits / total:.1%}")
+    print(f"LLM çağrısı:          {sources['miss']} (önce {total})")
+    print(f"Hızlı yol süresi:     {fast_path_ms:.2f} ms toplam, {fast_path_ms * 1000 / total:.1f} µs/başlık")
+    print(f"Kazanılan gecikme:    {saved_ms / 1000:.1f} s ({saved_ms / baseline_ms:.1%}, "
+          f"LLM çağrısı başına {args.llm_latency_ms:.0f} ms varsayımıyla)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -20,3 +20,70 @@ API_TITLE = "MedInsight API"
 API_DESCRIPTION = "Tıbbi literatür analiz platformu için backend API"
 API_VERSION = "1.0.0"
 
+
+# Arka plan ön ısıtma (prefetch) ayarları
+PREFETCH_ENABLED = os.getenv("PREFETCH_ENABLED", "true").lower() in ("1", "true", "yes")
+PREFETCH_INTERVAL_SECONDS = int(os.getenv("PREFETCH_INTERVAL_SECONDS", "900"))  # Döngü aralığı
+PREFETCH_TOP_N = int(os.getenv("PREFETCH_TOP_N", "20"))  # Isıtılacak en popüler anahtar kelime sayısı
+PREFETCH_LLM_BUDGET = int(os.getenv("PREFETCH_LLM_BUDGET", "400"))  # Döngü başına maksimum LLM çağrısı
+PREFETCH_OFFPEAK_START_HOUR = int(os.getenv("PREFETCH_OFFPEAK_START_HOUR", "1"))  # Yoğun olmayan saat başlangıcı (dahil)
+PREFETCH_OFFPEAK_END_HOUR = int(os.getenv("PREFETCH_OFFPEAK_END_HOUR", "6"))  # Yoğun olmayan saat bitişi (hariç)
+PREFETCH_MAX_TRACKED_KEYWORDS = int(os.getenv("PREFETCH_MAX_TRACKED_KEYWORDS", "5000"))
+PREFETCH_KEYWORD_HALF_LIFE_SECONDS = int(os.getenv("PREFETCH_KEYWORD_HALF_LIFE_SECONDS", "21600"))  # Popülerlik skorunun yarılanma süresi
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("RESULT_CACHE_TTL_SECONDS", "86400"))  # Analiz sonuç cache süresi
+RESULT_CACHE_MAX_ENTRIES = int(os.getenv("RESULT_CACHE_MAX_ENTRIES", "1000"))  # Cache'teki maksimum sorgu (LRU)
+
+# Event loop gecikme izleme ve profil alma ayarları
+LOOP_LAG_MONITOR_ENABLED = os.getenv("LOOP_LAG_MONITOR_ENABLED", "true").lower() in ("1", "true", "yes")
+LOOP_LAG_THRESHOLD_MS = int(os.getenv("LOOP_LAG_THRESHOLD_MS", "200"))  # Bu süreden uzun bloklamalar loglanır
+LOOP_LAG_CHECK_INTERVAL_MS = int(os.getenv("LOOP_LAG_CHECK_INTERVAL_MS", "50"))
+PROFILE_OUTPUT_DIR = os.getenv("PROFILE_OUTPUT_DIR", "profiles")
+PROFILE_SAMPLE_INTERVAL_MS = int(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "5"))
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN", None)  # Ayarlanmazsa /admin endpoint'leri kapalıdır
+
+# Kayıtlı arama (abonelik) ayarları
+SAVED_SEARCHES_ENABLED = os.getenv("SAVED_SEARCHES_ENABLED", "true").lower() in ("1", "true", "yes")
+SAVED_SEARCHES_PATH = os.getenv("SAVED_SEARCHES_PATH", "data/saved_searches.json")
+SAVED_SEARCH_CHECK_INTERVAL_SECONDS = int(os.getenv("SAVED_SEARCH_CHECK_INTERVAL_SECONDS", "3600"))  # Zamanlayıcı kontrol aralığı
+SAVED_SEARCH_RUN_EVERY_SECONDS = int(os.getenv("SAVED_SEARCH_RUN_EVERY_SECONDS", "604800"))  # Her aramanın çalışma sıklığı (haftalık)
+SAVED_SEARCH_FEED_LIMIT = int(os.getenv("SAVED_SEARCH_FEED_LIMIT", "200"))  # Akışta tutulan maksimum makale
+SAVED_SEARCH_MAX_SEEN_IDS = int(os.getenv("SAVED_SEARCH_MAX_SEEN_IDS", "5000"))
+
+# Toplu dışa aktarma (export) ayarları
+EXPORT_MAX_ARTICLES = int(os.getenv("EXPORT_MAX_ARTICLES", "10000"))  # Tek export'ta maksimum makale
+EXPORT_PAGE_SIZE = int(os.getenv("EXPORT_PAGE_SIZE", "50"))  # Kaynak sayfa boyutu
+EXPORT_CONCURRENCY = int(os.getenv("EXPORT_CONCURRENCY", "10"))  # Eşzamanlı işlenen makale sayısı
+EXPORT_ROW_GROUP_SIZE = int(os.getenv("EXPORT_ROW_GROUP_SIZE", "500"))  # Parquet row group boyutu
+
+# Kaynak API'leri için host başına eşzamanlı istek sınırı (arXiv ve Semantic Scholar kendi sınırlarını kullanır)
+SOURCE_HOST_CONCURRENCY = int(os.getenv("SOURCE_HOST_CONCURRENCY", "4"))
+
+# Analiz endpoint'i için kabul kontrolü (admission control) ayarları
+ADMISSION_MAX_INFLIGHT_ARTICLES = int(os.getenv("ADMISSION_MAX_INFLIGHT_ARTICLES", "100"))  # Aynı anda işlenen makale
+ADMISSION_MAX_QUEUED_ARTICLES = int(os.getenv("ADMISSION_MAX_QUEUED_ARTICLES", "100"))  # Kuyrukta bekleyen makale
+ADMISSION_MAX_CLIENT_ARTICLES = int(os.getenv("ADMISSION_MAX_CLIENT_ARTICLES", "100"))  # İstemci başına (işlenen + bekleyen)
+ADMISSION_QUEUE_TIMEOUT_SECONDS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SECONDS", "10"))
+ADMISSION_RETRY_AFTER_SECONDS = int(os.getenv("ADMISSION_RETRY_AFTER_SECONDS", "5"))
+
+# İstemci bağlantıyı kapatırsa devam eden analiz iptal edilir (kontrol aralığı)
+CLIENT_DISCONNECT_POLL_SECONDS = float(os.getenv("CLIENT_DISCONNECT_POLL_SECONDS", "0.5"))
+
+# Başlık çevirisi için tıbbi terim sözlüğü ve cache ayarları
+GLOSSARY_PATH = os.getenv("GLOSSARY_PATH", "data/medical_glossary.tsv")  # ingilizce<TAB>türkçe satırları
+TITLE_CACHE_SIZE = int(os.getenv("TITLE_CACHE_SIZE", "5000"))  # Birebir eşleşme cache'indeki maksimum başlık
+GLOSSARY_PROMPT_MAX_TERMS = int(os.getenv("GLOSSARY_PROMPT_MAX_TERMS", "8"))  # Prompt'a eklenen maksimum terim
+
+# Çapraz makale mikro-batch ayarları (başlık ve kısa abstract çevirileri tek LLM çağrısında)
+NLP_BATCH_ENABLED = os.getenv("NLP_BATCH_ENABLED", "true").lower() in ("1", "true", "yes")
+NLP_BATCH_WINDOW_MS = int(os.getenv("NLP_BATCH_WINDOW_MS", "10"))  # Bekleyen çağrıların toplandığı süre
+NLP_BATCH_MAX_ITEMS = int(os.getenv("NLP_BATCH_MAX_ITEMS", "20"))  # Tek çağrıdaki maksimum öğe
+NLP_BATCH_ABSTRACT_MAX_CHARS = int(os.getenv("NLP_BATCH_ABSTRACT_MAX_CHARS", "400"))  # Bundan kısa abstract'ler batch'lenir (0 kapatır)
+
+# Abstract'i eksik kayıtlar için toplu zenginleştirme (Europe PMC, API key varsa Semantic Scholar)
+ABSTRACT_ENRICHMENT_ENABLED = os.getenv("ABSTRACT_ENRICHMENT_ENABLED", "true").lower() in ("1", "true", "yes")
+ENRICHMENT_BATCH_SIZE = int(os.getenv("ENRICHMENT_BATCH_SIZE", "25"))  # Tek Europe PMC sorgusundaki kimlik sayısı
+ENRICHMENT_CACHE_SIZE = int(os.getenv("ENRICHMENT_CACHE_SIZE", "10000"))
+ENRICHMENT_CACHE_TTL_SECONDS = int(os.getenv("ENRICHMENT_CACHE_TTL_SECONDS", "86400"))  # Bulunamayanlar da bu süre cache'lenir
+
+# Tam abstract modunda aynı anda çevrilen maksimum parça (tüm istekler genelinde)
+FULL_TEXT_CONCURRENCY = int(os.getenv("FULL_TEXT_CONCURRENCY", "16"))
@@ -0,0 +1,53 @@
+"""
+MedInsight toplu dışa aktarma komut satırı aracı.
+Analiz edilmiş makaleleri JSONL veya Parquet dosyasına akış halinde yazar.
+
+Örnek:
+    python export_cli.py "diabetic retinopathy" --max-articles 2000 --format parquet -o retinopathy.parquet
+"""
+import argparse
+import asyncio
+import sys
+
+from config import EXPORT_MAX_ARTICLES, EXPORT_ROW_GROUP_SIZE
+from services.export_service import write_jsonl, write_parquet
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Analiz edilmiş makaleleri toplu olarak dışa aktar")
+    parser.add_argument("keyword", help="Aranacak anahtar kelime")
+    parser.add_argument("--max-articles", type=int, default=1000, help=f"Maksimum makale sayısı (en fazla {EXPORT_MAX_ARTICLES})")
+    parser.add_argument("--years", type=int, default=None, help="Son N yıl içindeki makaleler")
+    parser.add_argument("--format", choices=["jsonl", "parquet"], default="jsonl", help="Çıktı formatı")
+    parser.add_argument("-o", "--output", required=True, help="Çıktı dosyası")
+    parser.add_argument("--row-group-size", type=int, default=EXPORT_ROW_GROUP_SIZE, help="Parquet row group boyutu")
+    parser.add_argument("--full-abstract", action="store_true", help="Abstract'leri kısaltmadan tam çevir")
+    return parser.parse_args(argv)
+
+
+async def run(args: argparse.Namespace) -> int:
+    if args.format == "parquet":
+        return await write_parquet(
+            args.output,
+            args.keyword,
+            args.max_articles,
+            args.years,
+            args.full_abstract,
+            args.row_group_size
+        )
+    return await write_jsonl(args.output, args.keyword, args.max_articles, args.years, args.full_abstract)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    try:
+        count = asyncio.run(run(args))
+    except RuntimeError as e:
+        print(f"Hata: {str(e)}", file=sys.stderr)
+        return 1
+    print(f"{count} makale {args.output} dosyasına yazıldı")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,5 @@
-import { useState } from 'react';
-import { analyzeArticles } from './services/api';
+import { useRef, useState } from 'react';
+import { analyzeArticles, isCanceled } from './services/api';
 import SearchForm from './components/SearchForm';
 import ArticleList from './components/ArticleList';
 import LoadingSpinner from './components/LoadingSpinner';
@@ -9,21 +9,32 @@ function App() {
   const [articles, setArticles] = useState([]);
   const [loading, setLoading] = useState(false);
   const [error, setError] = useState(null);
+  // Sadece en son aramanın sonucu ekrana yazılır
+  const latestSearchId = useRef(0);
 
   const handleSearch = async (keyword, articleCount, timeRangeYears) => {
+    const searchId = ++latestSearchId.current;
     setLoading(true);
     setError(null);
     setArticles([]);
 
     try {
       const results = await analyzeArticles(keyword, articleCount, timeRangeYears);
-      setArticles(results);
+      if (searchId === latestSearchId.current) {
+        setArticles(results);
+      }
     } catch (err) {
+      // Yerini yeni aramaya bırakan istekler hata olarak gösterilmez
+      if (isCanceled(err) || searchId !== latestSearchId.current) {
+        return;
+      }
       const errorMessage = err?.detail || err?.error || err?.message || 'Bir hata oluştu. Lütfen tekrar deneyin.';
       setError(errorMessage);
       console.error('API Error:', err);
     } finally {
-      setLoading(false);
+      if (searchId === latestSearchId.current) {
+        setLoading(false);
+      }
     }
   };
 
@@ -38,7 +49,7 @@ function App() {
 
         {/* Search Form */}
         <div className="form-container">
-          <SearchForm onSearch={handleSearch} disabled={loading} />
+          <SearchForm onSearch={handleSearch} loading={loading} />
         </div>
 
         {/* Error Message */}
@@ -44,50 +44,56 @@ function ArticleCard({ article }) {
         </div>
       </div>
 
-      {/* Summary */}
-      <div className="article-section">
-        <h3>Özet</h3>
-        <p>{article.summary_tr}</p>
-      </div>
+      {/* Summary - düşük kademelerde (tier) boş gelebilir */}
+      {article.summary_tr && (
+        <div className="article-section">
+          <h3>Özet</h3>
+          <p>{article.summary_tr}</p>
+        </div>
+      )}
 
       {/* Key Takeaways */}
-      <div className="article-section">
-        <h3>Klinik Önemli Çıkarımlar</h3>
-        <ul className="article-list">
-          {article.key_takeaways_tr?.map((takeaway, index) => (
-            <li key={index}>{takeaway}</li>
-          ))}
-        </ul>
-      </div>
+      {article.key_takeaways_tr?.length > 0 && (
+        <div className="article-section">
+          <h3>Klinik Önemli Çıkarımlar</h3>
+          <ul className="article-list">
+            {article.key_takeaways_tr.map((takeaway, index) => (
+              <li key={index}>{takeaway}</li>
+            ))}
+          </ul>
+        </div>
+      )}
 
       {/* Expandable Abstract */}
-      <div style={{ borderTop: '1px solid #e5e7eb', paddingTop: '1rem' }}>
-        <button
-          onClick={() => setExpanded(!expanded)}
-          className="expand-btn"
-        >
-          {expanded ? 'Özeti Gizle' : 'Tam Çeviriyi Görüntüle'}
-          <svg
-            style={{
-              marginLeft: '0.5rem',
-              width: '1rem',
-              height: '1rem',
-              transform: expanded ? 'rotate(180deg)' : 'none',
-              transition: 'transform 0.2s'
-            }}
-            fill="none"
-            stroke="currentColor"
-            viewBox="0 0 24 24"
+      {article.abstract_tr && (
+        <div style={{ borderTop: '1px solid #e5e7eb', paddingTop: '1rem' }}>
+          <button
+            onClick={() => setExpanded(!expanded)}
+            className="expand-btn"
           >
-            <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M19 9l-7 7-7-7" />
-          </svg>
-        </button>
-        {expanded && (
-          <div className="expanded-content">
-            {article.abstract_tr}
-          </div>
-        )}
-      </div>
+            {expanded ? 'Özeti Gizle' : 'Tam Çeviriyi Görüntüle'}
+            <svg
+              style={{
+                marginLeft: '0.5rem',
+                width: '1rem',
+                height: '1rem',
+                transform: expanded ? 'rotate(180deg)' : 'none',
+                transition: 'transform 0.2s'
+              }}
+              fill="none"
+              stroke="currentColor"
+              viewBox="0 0 24 24"
+            >
+              <path strokeLinecap="round" strokeLinejoin="round" strokeWidth={2} d="M19 9l-7 7-7-7" />
+            </svg>
+          </button>
+          {expanded && (
+            <div className="expanded-content">
+              {article.abstract_tr}
+            </div>
+          )}
+        </div>
+      )}
 
       {/* External Link */}
       <div style={{ marginTop: '1rem', paddingTop: '1rem', borderTop: '1px solid #e5e7eb' }}>
@@ -1,10 +1,11 @@
 import { useState } from 'react';
 
-function SearchForm({ onSearch, disabled }) {
+function SearchForm({ onSearch, loading }) {
   const [keyword, setKeyword] = useState('');
   const [articleCount, setArticleCount] = useState(5);
   const [timeRangeYears, setTimeRangeYears] = useState('');
 
+  // Arama sürerken de gönderilebilir; yeni arama öncekini iptal eder
   const handleSubmit = (e) => {
     e.preventDefault();
     if (keyword.trim()) {
@@ -24,7 +25,6 @@ function SearchForm({ onSearch, disabled }) {
             onChange={(e) => setKeyword(e.target.value)}
             placeholder="Örn: diabetic retinopathy treatment"
             required
-            disabled={disabled}
           />
         </div>
 
@@ -39,7 +39,6 @@ function SearchForm({ onSearch, disabled }) {
               min="1"
               max="50"
               required
-              disabled={disabled}
             />
           </div>
 
@@ -53,7 +52,6 @@ function SearchForm({ onSearch, disabled }) {
               placeholder="Örn: 5"
               min="1"
               max="20"
-              disabled={disabled}
             />
           </div>
         </div>
@@ -61,9 +59,9 @@ function SearchForm({ onSearch, disabled }) {
         <button
           type="submit"
           className="btn"
-          disabled={disabled || !keyword.trim()}
+          disabled={!keyword.trim()}
         >
-          {disabled ? 'Aranıyor...' : 'Makale Ara'}
+          {loading ? 'Aranıyor...' : 'Makale Ara'}
         </button>
       </form>
     </div>
@@ -1,4 +1,5 @@
 import axios from 'axios';
+import { getCachedResult, setCachedResult } from './resultCache';
 
 const API_BASE_URL = 'http://localhost:8000';
 
@@ -9,19 +10,64 @@ const api = axios.create({
   },
 });
 
+// Devam eden analiz isteği - aynı parametrelerle tekrar gönderilirse paylaşılır,
+// farklı parametrelerle yeni arama yapılırsa iptal edilir
+let inflight = null;
+
+const resultKey = (keyword, articleCount, timeRangeYears) =>
+  JSON.stringify([keyword.trim().toLowerCase(), articleCount, timeRangeYears || null]);
+
+export const isCanceled = (error) => error?.canceled === true;
+
 export const analyzeArticles = async (keyword, articleCount, timeRangeYears) => {
+  const key = resultKey(keyword, articleCount, timeRangeYears);
+
+  // Çift gönderimde aynı istek beklenir, backend'e ikinci kez gidilmez
+  if (inflight?.key === key) {
+    return inflight.promise;
+  }
+
+  // Yeni arama öncekini geçersiz kılar; iptal backend'de NLP işlemlerini de durdurur
+  inflight?.controller.abort();
+
+  const controller = new AbortController();
+  const promise = (async () => {
+    const cached = await getCachedResult(key);
+    if (cached) {
+      return cached;
+    }
+    if (controller.signal.aborted) {
+      throw { canceled: true };
+    }
+
+    try {
+      const response = await api.post(
+        '/api/analyze_articles',
+        {
+          keyword,
+          article_count: articleCount,
+          time_range_years: timeRangeYears || null,
+        },
+        { signal: controller.signal }
+      );
+      await setCachedResult(key, response.data);
+      return response.data;
+    } catch (error) {
+      if (axios.isCancel(error)) {
+        throw { canceled: true };
+      }
+      throw error.response?.data || error.message;
+    }
+  })();
+
+  inflight = { key, controller, promise };
   try {
-    const response = await api.post('/api/analyze_articles', {
-      keyword,
-      article_count: articleCount,
-      time_range_years: timeRangeYears || null,
-    });
-    return response.data;
-  } catch (error) {
-    throw error.response?.data || error.message;
+    return await promise;
+  } finally {
+    if (inflight?.promise === promise) {
+      inflight = null;
+    }
   }
 };
 
 export default api;
-
-
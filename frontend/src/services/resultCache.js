@@ -0,0 +1,70 @@
+// IndexedDB tabanlı sonuç cache'i - geri gezinmede anında sonuç göstermek için.
+const DB_NAME = 'medinsight';
+const STORE_NAME = 'analyze_results';
+const DB_VERSION = 1;
+
+export const RESULT_TTL_MS = 30 * 60 * 1000; // 30 dakika
+const MAX_ENTRIES = 50;
+
+let dbPromise = null;
+
+const openDb = () => {
+  if (!dbPromise) {
+    dbPromise = new Promise((resolve, reject) => {
+      if (typeof indexedDB === 'undefined') {
+        reject(new Error('IndexedDB desteklenmiyor'));
+        return;
+      }
+      const request = indexedDB.open(DB_NAME, DB_VERSION);
+      request.onupgradeneeded = () => {
+        const store = request.result.createObjectStore(STORE_NAME, { keyPath: 'key' });
+        store.createIndex('storedAt', 'storedAt');
+      };
+      request.onsuccess = () => resolve(request.result);
+      request.onerror = () => reject(request.error);
+    }).catch((error) => {
+      // Bir sonraki çağrıda tekrar denensin
+      dbPromise = null;
+      throw error;
+    });
+  }
+  return dbPromise;
+};
+
+const promisify = (request) =>
+  new Promise((resolve, reject) => {
+    request.onsuccess = () => resolve(request.result);
+    request.onerror = () => reject(request.error);
+  });
+
+export const getCachedResult = async (key) => {
+  try {
+    const db = await openDb();
+    const entry = await promisify(db.transaction(STORE_NAME).objectStore(STORE_NAME).get(key));
+    if (!entry || Date.now() - entry.storedAt > RESULT_TTL_MS) {
+      return null;
+    }
+    return entry.value;
+  } catch {
+    // Cache hatası aramayı engellememeli
+    return null;
+  }
+};
+
+export const setCachedResult = async (key, value) => {
+  try {
+    const db = await openDb();
+    const store = db.transaction(STORE_NAME, 'readwrite').objectStore(STORE_NAME);
+    await promisify(store.put({ key, value, storedAt: Date.now() }));
+
+    // Süresi dolan ve en eski kayıtları temizle
+    const entries = await promisify(store.index('storedAt').getAll());
+    const expired = entries.filter(
+      (entry, index) =>
+        Date.now() - entry.storedAt > RESULT_TTL_MS || index < entries.length - MAX_ENTRIES
+    );
+    await Promise.all(expired.map((entry) => promisify(store.delete(entry.key))));
+  } catch {
+    // Cache yazılamazsa sessizce devam et
+  }
+};
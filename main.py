@@ -3,25 +3,99 @@ MedInsight API - Ana FastAPI uygulaması.
 Tıbbi literatür analiz platformu için backend API.
 """
 import asyncio
-from typing import List
-from fastapi import FastAPI, HTTPException, status
+import secrets
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Awaitable, Callable, List, Optional
+from fastapi import FastAPI, HTTPException, Header, Depends, Query, Request, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 
-from config import API_TITLE, API_DESCRIPTION, API_VERSION
-from models.schemas import AnalyzeArticlesRequest, ArticleResponse, ErrorResponse
-from services.academic_search_service import search_all_sources
-from services.nlp_service import (
-    translate_to_turkish,
-    translate_title,
-    generate_summary,
-    extract_key_takeaways
+from config import (
+    API_TITLE,
+    API_DESCRIPTION,
+    API_VERSION,
+    PREFETCH_ENABLED,
+    SAVED_SEARCHES_ENABLED,
+    LOOP_LAG_MONITOR_ENABLED,
+    ADMIN_TOKEN,
+    CLIENT_DISCONNECT_POLL_SECONDS,
+    EXPORT_CONCURRENCY
 )
+from models.schemas import (
+    AnalyzeArticlesRequest,
+    ArticleResponse,
+    AnalyzeArticlesPageRequest,
+    AnalyzeArticlesPageResponse,
+    SavedSearchCreate,
+    SavedSearch,
+    SavedSearchFeed,
+    ExportRequest,
+    ErrorResponse
+)
+from services.academic_search_service import stream_all_sources
+from services.admission_service import AdmissionRejected, admission_controller
+from services.analysis_service import analyze_search_results, analyze_article_stream
+from services.budget_service import RequestBudget, TIER_FULL
+from services.export_service import iter_jsonl
+from services.monitoring_service import (
+    LoopLagMonitor,
+    arm_profiling,
+    profiling_remaining,
+    profile_request
+)
+from services.pagination_service import (
+    InvalidCursorError,
+    PageCursor,
+    resolve_cursor,
+    search_all_sources_page
+)
+from services.prefetch_service import (
+    record_request,
+    get_cached_results,
+    store_results,
+    prefetch_loop
+)
+from services.subscription_service import (
+    create_saved_search,
+    list_saved_searches,
+    get_saved_search,
+    delete_saved_search,
+    get_feed,
+    run_saved_search,
+    saved_search_loop
+)
+
+
+# Event loop gecikme izleyicisi (lifespan içinde başlatılır)
+loop_lag_monitor = LoopLagMonitor()
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Uygulama yaşam döngüsü - arka plan görevlerini başlat ve durdur."""
+    background_tasks = []
+    if PREFETCH_ENABLED:
+        background_tasks.append(asyncio.create_task(prefetch_loop()))
+    if SAVED_SEARCHES_ENABLED:
+        background_tasks.append(asyncio.create_task(saved_search_loop()))
+    if LOOP_LAG_MONITOR_ENABLED:
+        loop_lag_monitor.start()
+
+    yield
+
+    if LOOP_LAG_MONITOR_ENABLED:
+        await loop_lag_monitor.stop()
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
 
 # FastAPI uygulamasını oluştur
 app = FastAPI(
     title=API_TITLE,
     description=API_DESCRIPTION,
-    version=API_VERSION
+    version=API_VERSION,
+    lifespan=lifespan
 )
 
 # CORS middleware ekle (gerekirse frontend entegrasyonu için)
@@ -41,7 +115,10 @@ async def root():
         "message": "MedInsight API çalışıyor",
         "version": API_VERSION,
         "endpoints": {
-            "analyze_articles": "/api/analyze_articles"
+            "analyze_articles": "/api/analyze_articles",
+            "analyze_articles_page": "/api/analyze_articles/page",
+            "saved_searches": "/api/saved_searches",
+            "export": "/api/export"
         }
     }
 
@@ -52,16 +129,106 @@ async def health_check():
     return {"status": "healthy"}
 
 
+def require_admin(x_admin_token: Optional[str] = Header(None)):
+    """Admin endpoint'leri için X-Admin-Token kontrolü (ADMIN_TOKEN ayarlı değilse kapalı)."""
+    if not ADMIN_TOKEN:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Not Found")
+    if not x_admin_token or not secrets.compare_digest(x_admin_token, ADMIN_TOKEN):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Geçersiz admin token")
+
+
+@app.get("/admin/loop_lag", dependencies=[Depends(require_admin)])
+async def loop_lag_stats():
+    """Event loop gecikme istatistikleri."""
+    return loop_lag_monitor.stats()
+
+
+@app.get("/admin/admission", dependencies=[Depends(require_admin)])
+async def admission_stats():
+    """Kabul kontrolü istatistikleri - kuyruk derinliği ve reddedilen istek sayıları."""
+    return admission_controller.stats()
+
+
+@asynccontextmanager
+async def admitted(http_request: Request, cost: int, budget: RequestBudget):
+    """İsteği kabul kontrolünden geçir; kapasite yoksa hemen 503 + Retry-After döndür."""
+    client_id = http_request.client.host if http_request.client else "unknown"
+    try:
+        async with admission_controller.admit(client_id, cost, timeout=budget.remaining_seconds()):
+            yield
+    except AdmissionRejected as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=f"Sunucu şu anda yoğun ({e.reason}). Lütfen daha sonra tekrar deneyin.",
+            headers={"Retry-After": str(e.retry_after)}
+        )
+
+
+class AdmittedStreamingResponse(StreamingResponse):
+    """
+    Kabul kapasitesini yanıt gönderimi bittiğinde bırakan StreamingResponse.
+    İstemci ilk parçadan önce koparsa gövde üreteci hiç başlamaz ve finally
+    bloğu çalışmaz; bu durumda da kapasite burada bırakılır.
+    """
+
+    def __init__(self, content, release: Callable[[], Awaitable[None]], **kwargs):
+        super().__init__(content, **kwargs)
+        self._release = release
+
+    async def __call__(self, scope, receive, send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            await self._release()
+
+
+# nginx'in "Client Closed Request" kodu; yanıtı okuyan kimse olmadığı için sadece loglarda görünür
+CLIENT_CLOSED_REQUEST = 499
+
+
+async def cancel_on_disconnect(http_request: Request, coro):
+    """
+    İşlemi görev olarak çalıştır; istemci bağlantıyı kapatırsa görevi iptal et.
+    İptal, analyze_article_stream ve stream_all_sources içindeki NLP ve kaynak
+    görevlerine yayılır; böylece terk edilmiş istekler LLM çağrısı harcamaz.
+    """
+    task = asyncio.ensure_future(coro)
+    try:
+        while True:
+            done, _ = await asyncio.wait({task}, timeout=CLIENT_DISCONNECT_POLL_SECONDS)
+            if done:
+                return task.result()
+            if await http_request.is_disconnected():
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+                print(f"İstemci bağlantıyı kapattı, analiz iptal edildi: {http_request.url.path}")
+                raise HTTPException(status_code=CLIENT_CLOSED_REQUEST, detail="İstemci bağlantıyı kapattı")
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+@app.post("/admin/profile", dependencies=[Depends(require_admin)])
+async def enable_profiling(requests: int = Query(1, ge=0, le=100)):
+    """
+    Sonraki N /api/analyze_articles isteğinin örnekleme profilini al.
+    Profiller PROFILE_OUTPUT_DIR altına folded stack formatında yazılır; 0 kapatır.
+    """
+    arm_profiling(requests)
+    return {"profile_requests_remaining": profiling_remaining()}
+
+
 @app.post(
     "/api/analyze_articles",
     response_model=List[ArticleResponse],
     status_code=status.HTTP_200_OK,
     responses={
         200: {"description": "Başarılı - İşlenmiş makale listesi döner"},
-        500: {"model": ErrorResponse, "description": "Sunucu hatası"}
+        500: {"model": ErrorResponse, "description": "Sunucu hatası"},
+        503: {"model": ErrorResponse, "description": "Sunucu yoğun - Retry-After başlığındaki süre sonra tekrar deneyin"}
     }
 )
-async def analyze_articles(request: AnalyzeArticlesRequest):
+async def analyze_articles(request: AnalyzeArticlesRequest, http_request: Request):
     """
     PubMed'den makale arama, çeviri, özet ve klinik çıkarım işlemlerini gerçekleştir.
     
@@ -72,80 +239,52 @@ async def analyze_articles(request: AnalyzeArticlesRequest):
     4. Klinik önemli çıkarımları belirleme (3-5 adet)
     
     Args:
-        request: AnalyzeArticlesRequest - keyword, article_count, time_range_years içerir
+        request: AnalyzeArticlesRequest - keyword, article_count, time_range_years ve
+            opsiyonel deadline_ms / token_budget içerir; bütçe daraldıkça makaleler
+            düşük kademede (tier) döner
     
     Returns:
         List[ArticleResponse]: İşlenmiş makale listesi
     """
+    # Süre sınırı istek geldiği anda başlar (kuyrukta bekleme dahil)
+    budget = RequestBudget(request.deadline_ms, request.token_budget)
+
+    # Popüler anahtar kelime takibi (ön ısıtma için)
+    record_request(request)
+
+    # Cache'ten dönen istekler kapasite tüketmez
+    cached_results = get_cached_results(request)
+    if cached_results:
+        return cached_results
+
+    # Admin profil almayı açtıysa bu isteği örnekle
+    async with profile_request("analyze_articles"):
+        async with admitted(http_request, request.article_count, budget):
+            return await cancel_on_disconnect(http_request, _analyze_articles(request, budget))
+
+
+async def _analyze_articles(request: AnalyzeArticlesRequest, budget: RequestBudget) -> List[ArticleResponse]:
     try:
-        # Step 1: Ücretsiz akademik kaynaklardan makaleleri çek
-        articles_data = await search_all_sources(
-            keyword=request.keyword,
-            article_count=request.article_count,
-            time_range_years=request.time_range_years
-        )
-        
-        if not articles_data:
-            return []
+        found_count = 0
+        # Kademeler istenen makale sayısına göre planlanır
+        budget.plan_articles(request.article_count)
+
+        # Step 1: Ücretsiz akademik kaynaklardan makaleleri akış halinde çek
+        async def articles_stream():
+            nonlocal found_count
+            async for article in stream_all_sources(
+                keyword=request.keyword,
+                article_count=request.article_count,
+                time_range_years=request.time_range_years
+            ):
+                found_count += 1
+                yield article
         
-        # Her makale için NLP işlemlerini gerçekleştir
-        processed_articles = []
+        # Step 2: Makaleler geldikçe NLP işlemlerini başlat (arama ile örtüşür)
+        processed_articles = await analyze_article_stream(articles_stream(), request.full_abstract, budget)
         
-        for article in articles_data:
-            try:
-                abstract_en = article.get("abstract_en", "")
-                
-                # Abstract boşsa atla
-                if not abstract_en or len(abstract_en.strip()) < 50:
-                    continue
-                
-                # Abstract'i kısalt (ilk 600 karakter) - token tasarrufu
-                abstract_en = abstract_en[:600] + "..." if len(abstract_en) > 600 else abstract_en
-                
-                # Step 2: NLP işlemleri - paralel olarak çalıştırılabilir
-                # Başlık çevirisi
-                title_tr_task = translate_title(article.get("title_en", ""))
-                
-                # Abstract çevirisi
-                abstract_tr_task = translate_to_turkish(abstract_en)
-                
-                # İlk iki işlemi bekle
-                title_tr, abstract_tr = await asyncio.gather(
-                    title_tr_task,
-                    abstract_tr_task
-                )
-                
-                # Özet ve çıkarımlar için abstract_tr'ye ihtiyaç var
-                # Özet oluştur (sadece abstract_tr kullan - token tasarrufu)
-                summary_tr = await generate_summary("", abstract_tr)  # abstract_en kullanma
-                
-                # Klinik çıkarımları çıkar (sadece summary_tr kullan - token tasarrufu)
-                key_takeaways_tr = await extract_key_takeaways(
-                    "",
-                    "",
-                    summary_tr
-                )
-                
-                # Response objesi oluştur
-                processed_article = ArticleResponse(
-                    pmid=article.get("paper_id", ""),  # paper_id kullan (pmid yerine)
-                    title_en=article.get("title_en", ""),
-                    title_tr=title_tr,
-                    authors=article.get("authors", []),
-                    publication_date=article.get("publication_date", ""),
-                    doi=article.get("doi"),
-                    pubmed_url=article.get("url", ""),  # url kullan (pubmed_url yerine)
-                    abstract_tr=abstract_tr,
-                    summary_tr=summary_tr,
-                    key_takeaways_tr=key_takeaways_tr
-                )
-                
-                processed_articles.append(processed_article)
-            
-            except Exception as e:
-                # Tek bir makale işlenirken hata oluşursa logla ve devam et
-                print(f"Uyarı: Makale işlenirken hata oluştu (ID: {article.get('paper_id', 'bilinmeyen')}): {str(e)}")
-                continue
+        if found_count == 0:
+            return []
         
         if not processed_articles:
             raise HTTPException(
@@ -153,6 +292,15 @@ async def analyze_articles(request: AnalyzeArticlesRequest):
                 detail="Hiçbir makale başarıyla işlenemedi. Lütfen farklı bir anahtar kelime deneyin."
             )
         
+        # Kademesi düşürülmüş sonuçlar cache'e yazılmaz
+        if all(article.tier == TIER_FULL for article in processed_articles):
+            store_results(
+                request.keyword,
+                request.time_range_years,
+                request.article_count,
+                processed_articles,
+                request.full_abstract
+            )
         return processed_articles
     
     except HTTPException:
@@ -169,6 +317,169 @@ async def analyze_articles(request: AnalyzeArticlesRequest):
         )
 
 
+@app.post(
+    "/api/analyze_articles/page",
+    response_model=AnalyzeArticlesPageResponse,
+    status_code=status.HTTP_200_OK,
+    responses={
+        200: {"description": "Başarılı - Sayfadaki yeni makaleler ve sonraki cursor döner"},
+        400: {"model": ErrorResponse, "description": "Geçersiz cursor"},
+        500: {"model": ErrorResponse, "description": "Sunucu hatası"},
+        503: {"model": ErrorResponse, "description": "Sunucu yoğun - Retry-After başlığındaki süre sonra tekrar deneyin"}
+    }
+)
+async def analyze_articles_page(request: AnalyzeArticlesPageRequest, http_request: Request):
+    """
+    Cursor tabanlı sayfalı analiz.
+    
+    İlk istek cursor olmadan yapılır; yanıttaki next_cursor bir sonraki
+    isteğe eklenerek sadece yeni makaleler çekilir ve işlenir. Önceki
+    sayfalar tekrar işlenmez.
+    
+    Args:
+        request: AnalyzeArticlesPageRequest - AnalyzeArticlesRequest alanları ve cursor
+    
+    Returns:
+        AnalyzeArticlesPageResponse: İşlenmiş makaleler ve sonraki cursor
+    """
+    budget = RequestBudget(request.deadline_ms, request.token_budget)
+
+    try:
+        cursor = resolve_cursor(
+            request.cursor,
+            request.keyword,
+            request.article_count,
+            request.time_range_years
+        )
+    except InvalidCursorError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+
+    async with admitted(http_request, request.article_count, budget):
+        return await cancel_on_disconnect(http_request, _analyze_articles_page(request, cursor, budget))
+
+
+async def _analyze_articles_page(request: AnalyzeArticlesPageRequest, cursor: PageCursor, budget: RequestBudget) -> AnalyzeArticlesPageResponse:
+    try:
+        articles_data, next_cursor = await search_all_sources_page(
+            keyword=request.keyword,
+            article_count=request.article_count,
+            time_range_years=request.time_range_years,
+            cursor=cursor
+        )
+        processed_articles = await analyze_search_results(articles_data, request.full_abstract, budget)
+
+        return AnalyzeArticlesPageResponse(
+            articles=processed_articles,
+            next_cursor=None if next_cursor.exhausted else next_cursor.encode()
+        )
+
+    except Exception as e:
+        error_message = f"Sayfalı analiz işlemi sırasında hata oluştu: {str(e)}"
+        print(f"Hata: {error_message}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=error_message
+        )
+
+
+@app.post(
+    "/api/saved_searches",
+    response_model=SavedSearch,
+    status_code=status.HTTP_201_CREATED
+)
+async def create_saved_search_endpoint(request: SavedSearchCreate):
+    """Kayıtlı arama oluştur; zamanlayıcı yeni makaleleri düzenli olarak akışa ekler."""
+    return await create_saved_search(request)
+
+
+@app.get("/api/saved_searches", response_model=List[SavedSearch])
+async def list_saved_searches_endpoint():
+    """Tüm kayıtlı aramaları listele."""
+    return await list_saved_searches()
+
+
+@app.delete("/api/saved_searches/{search_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_saved_search_endpoint(search_id: str):
+    """Kayıtlı aramayı ve akışını sil."""
+    if not await delete_saved_search(search_id):
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kayıtlı arama bulunamadı")
+
+
+@app.get(
+    "/api/saved_searches/{search_id}/feed",
+    response_model=SavedSearchFeed,
+    responses={404: {"model": ErrorResponse, "description": "Kayıtlı arama bulunamadı"}}
+)
+async def saved_search_feed(search_id: str, limit: int = Query(50, ge=1, le=200)):
+    """Kayıtlı aramanın akışı - son çalıştırmalarda bulunan yeni makaleler (en yeni önce)."""
+    feed = await get_feed(search_id, limit)
+    if feed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kayıtlı arama bulunamadı")
+    return feed
+
+
+@app.post(
+    "/api/saved_searches/{search_id}/run",
+    response_model=List[ArticleResponse],
+    responses={404: {"model": ErrorResponse, "description": "Kayıtlı arama bulunamadı"}}
+)
+async def run_saved_search_endpoint(search_id: str, http_request: Request):
+    """Kayıtlı aramayı hemen çalıştır; sadece son çalıştırmadan beri yeni olan makaleler döner."""
+    saved_search = await get_saved_search(search_id)
+    if saved_search is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kayıtlı arama bulunamadı")
+
+    async with admitted(http_request, saved_search.article_count, RequestBudget()):
+        try:
+            processed = await run_saved_search(search_id)
+        except Exception as e:
+            error_message = f"Kayıtlı arama çalıştırılırken hata oluştu: {str(e)}"
+            print(f"Hata: {error_message}")
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=error_message
+            )
+    if processed is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Kayıtlı arama bulunamadı")
+    return processed
+
+
+@app.post(
+    "/api/export",
+    response_class=StreamingResponse,
+    dependencies=[Depends(require_admin)],
+    responses={200: {"content": {"application/x-ndjson": {}}, "description": "Satır başına bir makale (JSONL)"}}
+)
+async def export_articles(request: ExportRequest, http_request: Request):
+    """
+    Analiz edilmiş makaleleri üretildikçe JSONL olarak akış halinde döndür.
+    Sistematik derlemeler gibi binlerce makalelik toplu işler içindir; sadece
+    admin token ile erişilebilir. Aynı anda EXPORT_CONCURRENCY makale
+    işlendiğinden o kadar kapasite tutulur.
+    """
+    # Kabul yanıt başlamadan alınır ki kapasite yoksa 503 dönebilsin
+    stack = AsyncExitStack()
+    await stack.enter_async_context(admitted(http_request, EXPORT_CONCURRENCY, RequestBudget()))
+
+    async def body():
+        try:
+            async for line in iter_jsonl(
+                request.keyword,
+                request.max_articles,
+                request.time_range_years,
+                request.full_abstract
+            ):
+                yield line
+        finally:
+            # Akış bittiğinde kapasiteyi hemen bırak (aclose tekrar çağrılırsa etkisizdir)
+            await stack.aclose()
+
+    return AdmittedStreamingResponse(body(), release=stack.aclose, media_type="application/x-ndjson")
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
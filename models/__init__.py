@@ -2,12 +2,26 @@
 from models.schemas import (
     AnalyzeArticlesRequest,
     ArticleResponse,
+    AnalyzeArticlesPageRequest,
+    AnalyzeArticlesPageResponse,
+    SavedSearchCreate,
+    SavedSearch,
+    FeedItem,
+    SavedSearchFeed,
+    ExportRequest,
     ErrorResponse
 )
 
 __all__ = [
     "AnalyzeArticlesRequest",
     "ArticleResponse",
+    "AnalyzeArticlesPageRequest",
+    "AnalyzeArticlesPageResponse",
+    "SavedSearchCreate",
+    "SavedSearch",
+    "FeedItem",
+    "SavedSearchFeed",
+    "ExportRequest",
     "ErrorResponse"
 ]
 
@@ -10,20 +10,74 @@ class AnalyzeArticlesRequest(BaseModel):
     keyword: str = Field(..., description="Aranacak anahtar kelime (arXiv, DOAJ, Europe PMC, Semantic Scholar)")
     article_count: int = Field(..., ge=1, le=50, description="Alınacak makale sayısı (1-50 arası)")
     time_range_years: Optional[int] = Field(None, ge=1, le=20, description="Son N yıl içindeki makaleler (opsiyonel)")
+    full_abstract: bool = Field(False, description="Abstract'i kısaltmadan, parçalara bölerek tam çevir (opsiyonel)")
+    deadline_ms: Optional[int] = Field(None, ge=500, le=600000, description="İstek için süre sınırı (ms); aşılacaksa çıktı kademeli azaltılır (opsiyonel)")
+    token_budget: Optional[int] = Field(None, ge=0, description="İstek için toplam LLM token bütçesi (opsiyonel)")
 
 
 class ArticleResponse(BaseModel):
     """İşlenmiş makale için response şeması."""
     pmid: str = Field(..., description="Makale ID (PMID veya diğer kaynak ID'leri)")
     title_en: str = Field(..., description="İngilizce başlık")
-    title_tr: str = Field(..., description="Türkçe başlık")
+    title_tr: Optional[str] = Field(None, description="Türkçe başlık (metadata kademesinde boş)")
     authors: List[str] = Field(..., description="Yazar listesi")
     publication_date: str = Field(..., description="Yayın tarihi (YYYY-MM-DD)")
     doi: Optional[str] = Field(None, description="Digital Object Identifier")
     pubmed_url: str = Field(..., description="Makale URL'i (PubMed veya diğer kaynaklar)")
-    abstract_tr: str = Field(..., description="Türkçe tam çeviri")
-    summary_tr: str = Field(..., description="Türkçe kısa özet (maksimum 4 cümle)")
-    key_takeaways_tr: List[str] = Field(..., min_length=3, max_length=3, description="Klinik önemli çıkarımlar (3 adet)")
+    abstract_tr: Optional[str] = Field(None, description="Türkçe tam çeviri (title_only ve altında boş)")
+    summary_tr: Optional[str] = Field(None, description="Türkçe kısa özet (maksimum 4 cümle; no_summary ve altında boş)")
+    key_takeaways_tr: Optional[List[str]] = Field(None, min_length=3, max_length=3, description="Klinik önemli çıkarımlar (3 adet; no_takeaways ve altında boş)")
+    tier: str = Field("full", description="Verilen işleme kademesi: full, no_takeaways, no_summary, title_only, metadata")
+
+
+class AnalyzeArticlesPageRequest(AnalyzeArticlesRequest):
+    """Cursor tabanlı sayfalı analiz isteği için şema."""
+    cursor: Optional[str] = Field(None, description="Önceki yanıttan dönen next_cursor (ilk sayfa için boş)")
+
+
+class AnalyzeArticlesPageResponse(BaseModel):
+    """Sayfalı analiz yanıtı için şema."""
+    articles: List[ArticleResponse] = Field(..., description="Bu sayfada yeni işlenen makaleler")
+    next_cursor: Optional[str] = Field(None, description="Sonraki sayfa için opak cursor (kaynaklar tükendiyse boş)")
+
+
+class SavedSearchCreate(BaseModel):
+    """Kayıtlı arama oluşturma isteği için şema."""
+    keyword: str = Field(..., description="Aranacak anahtar kelime")
+    article_count: int = Field(10, ge=1, le=50, description="Her çalıştırmada taranacak makale sayısı (1-50 arası)")
+    time_range_years: Optional[int] = Field(None, ge=1, le=20, description="Son N yıl içindeki makaleler (opsiyonel)")
+
+
+class SavedSearch(BaseModel):
+    """Kayıtlı arama ve yüksek su işareti (high-water mark) bilgisi."""
+    id: str = Field(..., description="Kayıtlı arama ID'si")
+    keyword: str = Field(..., description="Aranacak anahtar kelime")
+    article_count: int = Field(..., description="Her çalıştırmada taranacak makale sayısı")
+    time_range_years: Optional[int] = Field(None, description="Son N yıl içindeki makaleler")
+    created_at: str = Field(..., description="Oluşturulma zamanı (ISO 8601)")
+    last_run_at: Optional[str] = Field(None, description="Son çalıştırma zamanı (ISO 8601)")
+    last_publication_date: Optional[str] = Field(None, description="Görülen en yeni yayın tarihi (YYYY-MM-DD)")
+    seen_count: int = Field(0, description="Daha önce işlenmiş makale sayısı")
+
+
+class FeedItem(BaseModel):
+    """Kayıtlı arama akışındaki makale."""
+    found_at: str = Field(..., description="Makalenin akışa eklendiği zaman (ISO 8601)")
+    article: ArticleResponse = Field(..., description="İşlenmiş makale")
+
+
+class SavedSearchFeed(BaseModel):
+    """Kayıtlı arama akışı yanıtı (en yeni önce)."""
+    saved_search: SavedSearch = Field(..., description="Kayıtlı arama")
+    items: List[FeedItem] = Field(..., description="Akıştaki makaleler")
+
+
+class ExportRequest(BaseModel):
+    """Toplu dışa aktarma isteği için şema."""
+    keyword: str = Field(..., description="Aranacak anahtar kelime")
+    max_articles: int = Field(..., ge=1, le=10000, description="Dışa aktarılacak maksimum makale sayısı")
+    time_range_years: Optional[int] = Field(None, ge=1, le=20, description="Son N yıl içindeki makaleler (opsiyonel)")
+    full_abstract: bool = Field(False, description="Abstract'leri kısaltmadan tam çevir (opsiyonel)")
 
 
 class ErrorResponse(BaseModel):
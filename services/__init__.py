@@ -1,7 +1,9 @@
 """Services package - İş mantığı modülleri."""
-from services.academic_search_service import search_all_sources
+from services.academic_search_service import search_all_sources, stream_all_sources
+from services.analysis_service import process_article, analyze_search_results, analyze_article_stream
 from services.nlp_service import (
     translate_to_turkish,
+    translate_full_text,
     translate_title,
     generate_summary,
     extract_key_takeaways
@@ -9,7 +11,12 @@ from services.nlp_service import (
 
 __all__ = [
     "search_all_sources",
+    "stream_all_sources",
+    "process_article",
+    "analyze_search_results",
+    "analyze_article_stream",
     "translate_to_turkish",
+    "translate_full_text",
     "translate_title",
     "generate_summary",
     "extract_key_takeaways"
@@ -4,8 +4,13 @@ Semantic Scholar, arXiv, DOAJ ve Europe PMC API'lerini kullanır.
 """
 import httpx
 import asyncio
-from typing import List, Dict, Optional
-from datetime import datetime, timedelta
+import math
+import time
+import xml.etree.ElementTree as ET
+from collections import OrderedDict, deque
+from typing import List, Dict, Optional, Tuple, NamedTuple, Union, AsyncIterator, Callable
+from datetime import date, datetime, timedelta
+from urllib.parse import urlparse
 
 
 # Semantic Scholar API - Ücretsiz, API key gerektiriyor (kolay alınıyor)
@@ -24,67 +29,697 @@ DOAJ_API_URL = "https://doaj.org/api/v2/search/articles"
 # Europe PMC API - Ücretsiz, API key gerektirmiyor
 EUROPE_PMC_API_URL = "https://www.ebi.ac.uk/europepmc/webservices/rest/search"
 
+# Semantic Scholar toplu sorgu API'si (abstract zenginleştirme için)
+SEMANTIC_SCHOLAR_BATCH_URL = "https://api.semanticscholar.org/graph/v1/paper/batch"
+
+try:
+    from config import SOURCE_HOST_CONCURRENCY
+except ImportError:
+    SOURCE_HOST_CONCURRENCY = 4
+
+try:
+    from config import (
+        ABSTRACT_ENRICHMENT_ENABLED,
+        ENRICHMENT_BATCH_SIZE,
+        ENRICHMENT_CACHE_SIZE,
+        ENRICHMENT_CACHE_TTL_SECONDS
+    )
+except ImportError:
+    ABSTRACT_ENRICHMENT_ENABLED = True
+    ENRICHMENT_BATCH_SIZE = 25
+    ENRICHMENT_CACHE_SIZE = 10000
+    ENRICHMENT_CACHE_TTL_SECONDS = 86400
+
+# Kaynak API'lerinin tek istekte döndürdüğü maksimum kayıt
+MAX_PAGE_SIZE = 100
+
+# Bundan kısa abstract'ler analiz edilmez (zenginleştirme adayıdır)
+MIN_ABSTRACT_CHARS = 50
+
+# Semantic Scholar toplu sorgusundaki maksimum kimlik sayısı
+SEMANTIC_SCHOLAR_BATCH_LIMIT = 500
+
+# Host başına eşzamanlı istek sınırı - arXiv ve anahtarsız Semantic Scholar paralel isteklere izin vermiyor
+HOST_CONCURRENCY_LIMITS = {
+    "export.arxiv.org": 1,
+    "api.semanticscholar.org": 1
+}
+_host_semaphores: Dict[str, asyncio.Semaphore] = {}
+
+
+def _host_semaphore(url: str) -> asyncio.Semaphore:
+    host = urlparse(url).netloc
+    if host not in _host_semaphores:
+        _host_semaphores[host] = asyncio.Semaphore(HOST_CONCURRENCY_LIMITS.get(host, SOURCE_HOST_CONCURRENCY))
+    return _host_semaphores[host]
+
+
+async def _limited_get(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """Host başına eşzamanlılık sınırı altında GET isteği."""
+    async with _host_semaphore(url):
+        return await client.get(url, **kwargs)
+
+
+async def _limited_post(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """Host başına eşzamanlılık sınırı altında POST isteği."""
+    async with _host_semaphore(url):
+        return await client.post(url, **kwargs)
+
+
+# Sayfa konumu: arXiv/Semantic Scholar offset, DOAJ sayfa numarası, Europe PMC cursorMark
+PagePosition = Union[int, str]
+
+# Her kaynağın ilk sayfa konumu
+INITIAL_PAGE_POSITIONS: Dict[str, PagePosition] = {
+    "semantic_scholar": 0,
+    "arxiv": 0,
+    "europe_pmc": "*",
+    "doaj": 1
+}
+
+
+class SourcePage(NamedTuple):
+    """Bir kaynaktan çekilen tek sayfa."""
+    entries: List[Tuple[int, Dict]]  # (sayfadaki ham sıra, makale) - abstract'i ve DOI/PMID'si olmayanlar hariç
+    next_position: Optional[PagePosition]  # None ise kaynak tükendi
+    raw_count: int  # Sayfadaki ham kayıt sayısı
+
+
+def _start_date(time_range_years: Optional[int] = None, since: Optional[str] = None) -> Optional[date]:
+    """
+    Yıl aralığı ve 'since' (YYYY-MM-DD) filtrelerinden daha dar olan başlangıç tarihi.
+    Yıl aralığı, N yıl önceki yılın 1 Ocak'ından başlar.
+    """
+    candidates = []
+    if time_range_years:
+        candidates.append(date(datetime.now().year - time_range_years, 1, 1))
+    if since:
+        candidates.append(datetime.strptime(since[:10], "%Y-%m-%d").date())
+    return max(candidates) if candidates else None
+
+
+def _parse_semantic_scholar_paper(paper: Dict) -> Optional[Dict]:
+    abstract = paper.get("abstract") or ""
+    external_ids = paper.get("externalIds") or {}
+    doi = external_ids.get("DOI")
+    pmid = external_ids.get("PubMed")
+    # Abstract'siz kayıtlar DOI/PMID varsa zenginleştirme için tutulur
+    if not abstract and not (doi or pmid):
+        return None
+    return {
+        "source": "semantic_scholar",
+        "title_en": paper.get("title", ""),
+        "authors": [f"{author.get('name', '')}" for author in paper.get("authors", [])[:5]],  # İlk 5 yazar
+        "publication_date": paper.get("publicationDate") or f"{paper.get('year', '')}-01-01",
+        "abstract_en": abstract,  # Tam metin; kısaltma analiz aşamasında yapılır
+        "doi": doi,
+        "url": paper.get("url") or f"https://www.semanticscholar.org/paper/{paper.get('paperId', '')}",
+        "venue": paper.get("venue", ""),
+        "paper_id": paper.get("paperId", ""),
+        "pmid": pmid
+    }
+
+
+async def fetch_semantic_scholar_page(
+    client: httpx.AsyncClient,
+    keyword: str,
+    page_size: int,
+    time_range_years: Optional[int] = None,
+    position: PagePosition = 0,
+    since: Optional[str] = None
+) -> SourcePage:
+    """
+    Semantic Scholar'dan `offset` ile tek sayfa çek.
+    API key: https://www.semanticscholar.org/product/api adresinden alınabilir (ücretsiz)
+    """
+    headers = {}
+    # Semantic Scholar API key opsiyonel (ücretsiz tier için gerekli değil)
+    if SEMANTIC_SCHOLAR_API_KEY:
+        headers["x-api-key"] = SEMANTIC_SCHOLAR_API_KEY
+
+    params = {
+        "query": keyword,
+        "offset": position,
+        "limit": min(page_size, MAX_PAGE_SIZE),
+        "fields": "title,authors,year,abstract,url,venue,publicationDate,externalIds"
+    }
+    if since:
+        # Sadece verilen tarihten sonra yayınlananlar
+        params["publicationDateOrYear"] = f"{since}:"
+
+    response = await _limited_get(client, SEMANTIC_SCHOLAR_API_URL, params=params, headers=headers)
+    response.raise_for_status()
+    data = response.json()
+
+    papers = data.get("data", [])
+    entries = []
+    for index, paper in enumerate(papers):
+        article = _parse_semantic_scholar_paper(paper)
+        if article:
+            entries.append((index, article))
+
+    # "next" alanı sadece devam eden sonuç varsa döner
+    return SourcePage(entries, data.get("next"), len(papers))
+
+
+def _parse_arxiv_entry(entry: ET.Element, namespace: Dict[str, str]) -> Optional[Dict]:
+    title = entry.find('atom:title', namespace)
+    summary = entry.find('atom:summary', namespace)
+    published = entry.find('atom:published', namespace)
+    authors = entry.findall('atom:author', namespace)
+    link = entry.find('atom:id', namespace)
+
+    if summary is None or not summary.text:
+        return None
+
+    author_list = [author.find('atom:name', namespace).text for author in authors[:5] if author.find('atom:name', namespace) is not None]  # İlk 5 yazar
+    return {
+        "source": "arxiv",
+        "title_en": title.text if title is not None else "",
+        "authors": author_list,
+        "publication_date": published.text[:10] if published is not None else "",
+        "abstract_en": summary.text.strip(),
+        "doi": None,
+        "url": link.text if link is not None else "",
+        "venue": "arXiv",
+        "paper_id": link.text.split('/')[-1] if link is not None else ""
+    }
+
+
+async def fetch_arxiv_page(
+    client: httpx.AsyncClient,
+    keyword: str,
+    page_size: int,
+    time_range_years: Optional[int] = None,
+    position: PagePosition = 0,
+    since: Optional[str] = None
+) -> SourcePage:
+    """
+    arXiv'den `start` ile tek sayfa çek.
+    Tamamen ücretsiz, API key gerektirmiyor.
+    """
+    # arXiv arama sorgusu
+    search_query = f'all:{keyword}'
+
+    # Tarih filtresi
+    start_date = _start_date(time_range_years, since)
+    if start_date:
+        search_query += f" AND submittedDate:[{start_date.strftime('%Y%m%d')}* TO {datetime.now().strftime('%Y%m%d')}]"
+
+    max_results = min(page_size, MAX_PAGE_SIZE)
+    params = {
+        "search_query": search_query,
+        "start": position,
+        "max_results": max_results,
+        "sortBy": "relevance",
+        "sortOrder": "descending"
+    }
+
+    response = await _limited_get(client, ARXIV_API_URL, params=params)
+    response.raise_for_status()
+
+    # XML parse et
+    root = ET.fromstring(response.text)
+    namespace = {'atom': 'http://www.w3.org/2005/Atom'}
+
+    raw_entries = root.findall('atom:entry', namespace)
+    entries = []
+    for index, entry in enumerate(raw_entries):
+        article = _parse_arxiv_entry(entry, namespace)
+        if article:
+            entries.append((index, article))
+
+    next_position = int(position) + len(raw_entries) if len(raw_entries) >= max_results else None
+    return SourcePage(entries, next_position, len(raw_entries))
+
+
+def _parse_europe_pmc_result(result: Dict) -> Optional[Dict]:
+    abstract_text = result.get("abstractText", "")
+    # Abstract'siz kayıtlar DOI/PMID varsa zenginleştirme için tutulur
+    if not abstract_text and not (result.get("doi") or result.get("pmid")):
+        return None
+
+    authors = []
+    if result.get("authorList", {}).get("author"):
+        for author in result["authorList"]["author"][:5]:  # İlk 5 yazar
+            name = f"{author.get('firstName', '')} {author.get('lastName', '')}".strip()
+            if name:
+                authors.append(name)
+
+    return {
+        "source": "europe_pmc",
+        "title_en": result.get("title", ""),
+        "authors": authors,
+        "publication_date": result.get("firstPublicationDate", "")[:10] if result.get("firstPublicationDate") else "",
+        "abstract_en": abstract_text,
+        "doi": result.get("doi"),
+        "url": f"https://europepmc.org/article/MED/{result.get('pmid', '')}" if result.get("pmid") else result.get("fullTextUrlList", {}).get("fullTextUrl", [{}])[0].get("url", ""),
+        "venue": result.get("journalTitle", ""),
+        "paper_id": result.get("pmid") or result.get("id", ""),
+        "pmid": result.get("pmid")
+    }
+
+
+async def fetch_europe_pmc_page(
+    client: httpx.AsyncClient,
+    keyword: str,
+    page_size: int,
+    time_range_years: Optional[int] = None,
+    position: PagePosition = "*",
+    since: Optional[str] = None
+) -> SourcePage:
+    """
+    Europe PMC'den `cursorMark` ile tek sayfa çek.
+    Ücretsiz, API key gerektirmiyor.
+    """
+    # Tarih filtresi
+    date_filter = ""
+    if time_range_years:
+        year = datetime.now().year - time_range_years
+        date_filter = f" AND PUB_YEAR:[{year} TO {datetime.now().year}]"
+    if since:
+        date_filter += f" AND FIRST_PDATE:[{since} TO {datetime.now().strftime('%Y-%m-%d')}]"
+
+    params = {
+        "query": f"{keyword}{date_filter}",
+        "resultType": "core",
+        "pageSize": min(page_size, MAX_PAGE_SIZE),
+        "cursorMark": position,
+        "format": "json"
+    }
+
+    response = await _limited_get(client, EUROPE_PMC_API_URL, params=params)
+    response.raise_for_status()
+    data = response.json()
+
+    results = data.get("resultList", {}).get("result", [])
+    entries = []
+    for index, result in enumerate(results):
+        article = _parse_europe_pmc_result(result)
+        if article:
+            entries.append((index, article))
+
+    # Son sayfada nextCursorMark değişmez
+    next_cursor = data.get("nextCursorMark")
+    next_position = next_cursor if results and next_cursor and next_cursor != position else None
+    return SourcePage(entries, next_position, len(results))
+
+
+def _parse_doaj_result(result: Dict) -> Optional[Dict]:
+    abstract_text = result.get("bibjson", {}).get("abstract", "")
+    identifiers = result.get("bibjson", {}).get("identifier") or []
+    has_doi = any(isinstance(identifier, dict) and identifier.get("type", "").lower() == "doi" for identifier in identifiers)
+    # Abstract'siz kayıtlar DOI varsa zenginleştirme için tutulur
+    if not abstract_text and not has_doi:
+        return None
+
+    authors = []
+    if result.get("bibjson", {}).get("author"):
+        for author in result["bibjson"]["author"][:5]:  # İlk 5 yazar
+            if isinstance(author, dict):
+                name = author.get("name", "")
+            else:
+                name = str(author)
+            if name:
+                authors.append(name)
+
+    return {
+        "source": "doaj",
+        "title_en": result.get("bibjson", {}).get("title", ""),
+        "authors": authors,
+        "publication_date": result.get("bibjson", {}).get("year", "") + "-01-01" if result.get("bibjson", {}).get("year") else "",
+        "abstract_en": abstract_text,
+        "doi": result.get("bibjson", {}).get("identifier", [{}])[0].get("id") if result.get("bibjson", {}).get("identifier") else None,
+        "url": result.get("bibjson", {}).get("link", [{}])[0].get("url", "") if result.get("bibjson", {}).get("link") else "",
+        "venue": result.get("bibjson", {}).get("journal", {}).get("title", ""),
+        "paper_id": result.get("id", "")
+    }
+
+
+async def fetch_doaj_page(
+    client: httpx.AsyncClient,
+    keyword: str,
+    page_size: int,
+    time_range_years: Optional[int] = None,
+    position: PagePosition = 1,
+    since: Optional[str] = None
+) -> SourcePage:
+    """
+    DOAJ (Directory of Open Access Journals) API'den `page` ile tek sayfa çek.
+    Ücretsiz, API key gerektirmiyor.
+    """
+    # Tarih filtresi
+    # DOAJ sadece yıl bazında filtrelenebilir
+    date_filter = ""
+    start_date = _start_date(time_range_years, since)
+    if start_date:
+        date_filter = f" AND year:[{start_date.year} TO {datetime.now().year}]"
+
+    page_size = min(page_size, MAX_PAGE_SIZE)
+    params = {
+        "q": f"{keyword}{date_filter}",
+        "page": position,
+        "pageSize": page_size
+    }
+
+    response = await _limited_get(client, DOAJ_API_URL, params=params)
+    response.raise_for_status()
+    data = response.json()
+
+    results = data.get("results", [])
+    entries = []
+    for index, result in enumerate(results):
+        article = _parse_doaj_result(result)
+        if article:
+            entries.append((index, article))
+
+    next_position = int(position) + 1 if len(results) >= page_size else None
+    return SourcePage(entries, next_position, len(results))
+
+
+def article_identifier(article: Dict) -> Optional[str]:
+    """Tekrar tespiti için makale kimliği (DOI, yoksa URL, yoksa kaynak ID'si)."""
+    return article.get("doi") or article.get("url") or article.get("paper_id")
+
+
+# Semantic Scholar varsayılan olarak kapalı (API key gerektiriyor)
+DEFAULT_SOURCES = ["arxiv", "europe_pmc", "doaj"]
+
+# Kaynak adı -> sayfa çekme fonksiyonu (varsayılan sıralama önceliği bu sıradır)
+PAGE_FETCHERS = {
+    "semantic_scholar": fetch_semantic_scholar_page,
+    "arxiv": fetch_arxiv_page,
+    "europe_pmc": fetch_europe_pmc_page,
+    "doaj": fetch_doaj_page
+}
+
+
+# --- Abstract zenginleştirme ---
+# Kimlik ("doi:..." / "pmid:...") -> (abstract veya None, son geçerlilik zamanı)
+_abstract_cache: "OrderedDict[str, Tuple[Optional[str], float]]" = OrderedDict()
+
+
+def _has_abstract(article: Dict) -> bool:
+    return len((article.get("abstract_en") or "").strip()) >= MIN_ABSTRACT_CHARS
+
+
+def _enrichment_keys(article: Dict) -> List[str]:
+    keys = []
+    doi = (article.get("doi") or "").strip().lower()
+    # Bazı kaynaklar DOI alanına ISSN yazabiliyor; sadece gerçek DOI'ler sorgulanır
+    if doi.startswith("10."):
+        keys.append(f"doi:{doi}")
+    pmid = str(article.get("pmid") or "").strip()
+    if pmid.isdigit():
+        keys.append(f"pmid:{pmid}")
+    return keys
+
+
+def _cache_get(key: str) -> Tuple[bool, Optional[str]]:
+    entry = _abstract_cache.get(key)
+    if entry is None or entry[1] < time.monotonic():
+        return False, None
+    _abstract_cache.move_to_end(key)
+    return True, entry[0]
+
+
+def _cache_put(key: str, abstract: Optional[str]) -> None:
+    _abstract_cache[key] = (abstract, time.monotonic() + ENRICHMENT_CACHE_TTL_SECONDS)
+    _abstract_cache.move_to_end(key)
+    while len(_abstract_cache) > ENRICHMENT_CACHE_SIZE:
+        _abstract_cache.popitem(last=False)
+
+
+def _europe_pmc_id_query(key: str) -> str:
+    kind, value = key.split(":", 1)
+    if kind == "doi":
+        return f'DOI:"{value}"'
+    return f"(EXT_ID:{value} AND SRC:MED)"
+
+
+async def _lookup_europe_pmc(client: httpx.AsyncClient, keys: List[str]) -> Dict[str, str]:
+    """Kimlikleri 'DOI:"x" OR EXT_ID:y' sorgularıyla toplu olarak Europe PMC'de ara."""
+    found = {}
+    for start in range(0, len(keys), ENRICHMENT_BATCH_SIZE):
+        chunk = keys[start:start + ENRICHMENT_BATCH_SIZE]
+        params = {
+            "query": " OR ".join(_europe_pmc_id_query(key) for key in chunk),
+            "resultType": "core",
+            "pageSize": min(len(chunk) * 2, MAX_PAGE_SIZE),  # Aynı DOI'nin birden çok kaydı olabilir
+            "format": "json"
+        }
+        response = await _limited_get(client, EUROPE_PMC_API_URL, params=params)
+        response.raise_for_status()
+
+        for result in response.json().get("resultList", {}).get("result", []):
+            abstract = result.get("abstractText") or ""
+            if len(abstract.strip()) < MIN_ABSTRACT_CHARS:
+                continue
+            if result.get("doi"):
+                found.setdefault(f"doi:{result['doi'].lower()}", abstract)
+            if result.get("pmid"):
+                found.setdefault(f"pmid:{result['pmid']}", abstract)
+    return found
+
+
+async def _lookup_semantic_scholar(client: httpx.AsyncClient, keys: List[str]) -> Dict[str, str]:
+    """Kimlikleri Semantic Scholar toplu sorgu API'si (POST /paper/batch) ile ara."""
+    headers = {"x-api-key": SEMANTIC_SCHOLAR_API_KEY} if SEMANTIC_SCHOLAR_API_KEY else {}
+    found = {}
+    for start in range(0, len(keys), SEMANTIC_SCHOLAR_BATCH_LIMIT):
+        chunk = keys[start:start + SEMANTIC_SCHOLAR_BATCH_LIMIT]
+        ids = [f"{'DOI' if key.startswith('doi:') else 'PMID'}:{key.split(':', 1)[1]}" for key in chunk]
+        response = await _limited_post(
+            client,
+            SEMANTIC_SCHOLAR_BATCH_URL,
+            params={"fields": "abstract"},
+            json={"ids": ids},
+            headers=headers
+        )
+        response.raise_for_status()
+
+        # Yanıt istek sırasıyla hizalıdır; bulunamayanlar null döner
+        for key, paper in zip(chunk, response.json()):
+            abstract = (paper or {}).get("abstract") or ""
+            if len(abstract.strip()) >= MIN_ABSTRACT_CHARS:
+                found[key] = abstract
+    return found
+
+
+async def enrich_abstracts(client: httpx.AsyncClient, articles: List[Dict]) -> int:
+    """
+    Abstract'i eksik makalelerin abstract'lerini DOI/PMID ile toplu olarak çözer.
+
+    Önce cache'e bakılır; kalanlar Europe PMC'de, API key varsa bulunamayanlar
+    Semantic Scholar'da tek sorguda aranır. Europe PMC'den abstract'siz gelen
+    kayıtlar aynı indekste tekrar aranmaz, doğrudan Semantic Scholar'a gider.
+    Sorgulanıp bulunamayan kimlikler de cache'lenir. Makaleler yerinde güncellenir.
+
+    Returns:
+        Abstract'i tamamlanan makale sayısı
+    """
+    candidates = [article for article in articles if not _has_abstract(article) and _enrichment_keys(article)]
+    if not candidates:
+        return 0
+
+    resolved: Dict[str, Optional[str]] = {}
+    missing = []
+    # Europe PMC dışındaki kaynaklardan gelen kimlikler; sadece bunlar Europe PMC'de aranır
+    europe_pmc_lookup = set()
+    for article in candidates:
+        for key in _enrichment_keys(article):
+            hit, abstract = _cache_get(key)
+            if hit:
+                resolved[key] = abstract
+                continue
+            if key not in missing:
+                missing.append(key)
+            if article.get("source") != "europe_pmc":
+                europe_pmc_lookup.add(key)
+
+    if missing:
+        found = {}
+        queried = []
+        try:
+            europe_pmc_keys = [key for key in missing if key in europe_pmc_lookup]
+            if europe_pmc_keys:
+                found.update(await _lookup_europe_pmc(client, europe_pmc_keys))
+                queried.extend(europe_pmc_keys)
+            remaining = [key for key in missing if key not in found]
+            if remaining and SEMANTIC_SCHOLAR_API_KEY:
+                found.update(await _lookup_semantic_scholar(client, remaining))
+                queried.extend(remaining)
+        except Exception as e:
+            # Hatalı sorgu cache'lenmez; makaleler abstract'siz kalır
+            print(f"Uyarı: Abstract zenginleştirme hatası ({len(missing)} kimlik): {str(e)}")
+        else:
+            # Hiçbir yerde sorgulanmayan kimlikler "bulunamadı" olarak cache'lenmez
+            for key in set(queried):
+                _cache_put(key, found.get(key))
+        resolved.update(found)
+
+    enriched = 0
+    for article in candidates:
+        abstract = next((resolved[key] for key in _enrichment_keys(article) if resolved.get(key)), None)
+        if abstract:
+            article["abstract_en"] = abstract
+            enriched += 1
+    return enriched
+
+
+async def fetch_source_page(
+    client: httpx.AsyncClient,
+    source: str,
+    keyword: str,
+    page_size: int,
+    time_range_years: Optional[int] = None,
+    position: Optional[PagePosition] = None,
+    since: Optional[str] = None
+) -> SourcePage:
+    """
+    Kaynaktan tek sayfa çek, abstract'i eksik kayıtları toplu zenginleştir ve
+    abstract'i hâlâ yetersiz olanları at. Böylece atılan kayıtlar makale
+    sayısı sınırına dahil olmaz.
+    """
+    if position is None:
+        position = INITIAL_PAGE_POSITIONS[source]
+    page = await PAGE_FETCHERS[source](client, keyword, page_size, time_range_years, position, since)
+
+    if ABSTRACT_ENRICHMENT_ENABLED:
+        await enrich_abstracts(client, [article for _, article in page.entries])
+
+    entries = [(index, article) for index, article in page.entries if _has_abstract(article)]
+    return page._replace(entries=entries)
+
+
+SOURCE_API_URLS = {
+    "semantic_scholar": SEMANTIC_SCHOLAR_API_URL,
+    "arxiv": ARXIV_API_URL,
+    "europe_pmc": EUROPE_PMC_API_URL,
+    "doaj": DOAJ_API_URL
+}
+
+# Konumu önceden hesaplanabilen (offset/sayfa numaralı) kaynaklar; sayfaları paralel çekilebilir.
+# Europe PMC cursorMark ile sıralı ilerler.
+OFFSET_SOURCES = {"semantic_scholar", "arxiv", "doaj"}
+
+
+def _page_position(source: str, page_index: int, page_size: int) -> PagePosition:
+    if source == "doaj":
+        return page_index + 1
+    return page_index * page_size
+
+
+async def iter_source_pages(
+    client: httpx.AsyncClient,
+    source: str,
+    keyword: str,
+    total: int,
+    time_range_years: Optional[int] = None,
+    since: Optional[str] = None
+) -> AsyncIterator[SourcePage]:
+    """
+    Bir kaynaktan `total` kayda kadar çok sayfalı çekim; sayfalar sırayla üretilir.
+
+    Offset tabanlı kaynaklarda sonraki sayfalar host sınırı kadar paralel
+    çekilir; Europe PMC'de cursorMark ile sıralı ilerlenir. Sayfalar
+    tüketildikçe parse edildiğinden tüm sonuçlar aynı anda bellekte tutulmaz.
+    """
+    page_size = min(total, MAX_PAGE_SIZE)
+    page_count = math.ceil(total / page_size)
+
+    if source not in OFFSET_SOURCES:
+        position = INITIAL_PAGE_POSITIONS[source]
+        for _ in range(page_count):
+            page = await fetch_source_page(client, source, keyword, page_size, time_range_years, position, since)
+            yield page
+            if page.next_position is None:
+                return
+            position = page.next_position
+        return
+
+    # Host sınırı kadar sayfa önden çekilir (sınır semafor ile ayrıca uygulanır)
+    host = urlparse(SOURCE_API_URLS[source]).netloc
+    window = HOST_CONCURRENCY_LIMITS.get(host, SOURCE_HOST_CONCURRENCY)
+    pending = deque()
+    next_index = 0
+
+    def launch() -> None:
+        nonlocal next_index
+        position = _page_position(source, next_index, page_size)
+        pending.append(asyncio.create_task(
+            fetch_source_page(client, source, keyword, page_size, time_range_years, position, since)
+        ))
+        next_index += 1
+
+    try:
+        while next_index < min(window, page_count):
+            launch()
+        while pending:
+            page = await pending.popleft()
+            yield page
+            if page.next_position is None:
+                return
+            if next_index < page_count:
+                launch()
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+async def iter_source_articles(
+    client: httpx.AsyncClient,
+    source: str,
+    keyword: str,
+    limit: int,
+    time_range_years: Optional[int] = None,
+    since: Optional[str] = None
+) -> AsyncIterator[Dict]:
+    """
+    Bir kaynağın makalelerini sayfa sayfa çekip parse edildikçe üret (en fazla `limit`).
+    Tüketici durduğunda önden çekilen sayfalar iptal edilir.
+    """
+    produced = 0
+    pages = iter_source_pages(client, source, keyword, limit, time_range_years, since)
+    try:
+        async for page in pages:
+            for _, article in page.entries:
+                yield article
+                produced += 1
+                if produced >= limit:
+                    return
+    finally:
+        # Önden çekilen sayfaları iptal et
+        await pages.aclose()
+
+
+async def _search_source(
+    source: str,
+    keyword: str,
+    article_count: int,
+    time_range_years: Optional[int],
+    since: Optional[str]
+) -> List[Dict]:
+    # 100'den fazla makale istenirse birden çok sayfa çekilir
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        return [
+            article
+            async for article in iter_source_articles(client, source, keyword, article_count, time_range_years, since)
+        ]
+
 
 async def search_semantic_scholar(
     keyword: str,
     article_count: int,
-    time_range_years: Optional[int] = None
+    time_range_years: Optional[int] = None,
+    since: Optional[str] = None
 ) -> List[Dict]:
     """
     Semantic Scholar API ile makale arama.
     API key: https://www.semanticscholar.org/product/api adresinden alınabilir (ücretsiz)
     """
     try:
-        headers = {}
-        # Semantic Scholar API key opsiyonel (ücretsiz tier için gerekli değil)
-        try:
-            from config import SEMANTIC_SCHOLAR_API_KEY as api_key
-            if api_key:
-                headers["x-api-key"] = api_key
-        except (ImportError, AttributeError):
-            pass
-        
-        # Tarih filtresi
-        year_filter = ""
-        if time_range_years:
-            year = datetime.now().year - time_range_years
-            year_filter = f",year:>={year}"
-        
-        params = {
-            "query": keyword,
-            "limit": min(article_count, 100),
-            "fields": "title,authors,year,abstract,url,doi,venue,publicationDate"
-        }
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(
-                SEMANTIC_SCHOLAR_API_URL,
-                params=params,
-                headers=headers
-            )
-            response.raise_for_status()
-            data = response.json()
-            
-            articles = []
-            for paper in data.get("data", [])[:article_count]:
-                abstract = paper.get("abstract", "")
-                if abstract:
-                    # Abstract'i kısalt (ilk 600 karakter) - token tasarrufu
-                    abstract_short = abstract[:600] + "..." if len(abstract) > 600 else abstract
-                    articles.append({
-                        "source": "semantic_scholar",
-                        "title_en": paper.get("title", ""),
-                        "authors": [f"{author.get('name', '')}" for author in paper.get("authors", [])[:5]],  # İlk 5 yazar
-                        "publication_date": paper.get("publicationDate") or f"{paper.get('year', '')}-01-01",
-                        "abstract_en": abstract_short,
-                        "doi": paper.get("doi"),
-                        "url": paper.get("url") or f"https://www.semanticscholar.org/paper/{paper.get('paperId', '')}",
-                        "venue": paper.get("venue", ""),
-                        "paper_id": paper.get("paperId", "")
-                    })
-            
-            return articles
-    
+        return await _search_source("semantic_scholar", keyword, article_count, time_range_years, since)
     except Exception as e:
         print(f"Semantic Scholar arama hatası: {str(e)}")
         return []
@@ -93,67 +728,15 @@ async def search_semantic_scholar(
 async def search_arxiv(
     keyword: str,
     article_count: int,
-    time_range_years: Optional[int] = None
+    time_range_years: Optional[int] = None,
+    since: Optional[str] = None
 ) -> List[Dict]:
     """
     arXiv API ile makale arama.
     Tamamen ücretsiz, API key gerektirmiyor.
     """
     try:
-        # arXiv arama sorgusu
-        search_query = f'all:{keyword}'
-        
-        # Tarih filtresi
-        if time_range_years:
-            year = datetime.now().year - time_range_years
-            search_query += f" AND submittedDate:[{year}0101* TO {datetime.now().strftime('%Y%m%d')}]"
-        
-        params = {
-            "search_query": search_query,
-            "start": 0,
-            "max_results": min(article_count, 100),
-            "sortBy": "relevance",
-            "sortOrder": "descending"
-        }
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(ARXIV_API_URL, params=params)
-            response.raise_for_status()
-            
-            # XML parse et
-            import xml.etree.ElementTree as ET
-            root = ET.fromstring(response.text)
-            
-            articles = []
-            namespace = {'atom': 'http://www.w3.org/2005/Atom'}
-            
-            for entry in root.findall('atom:entry', namespace)[:article_count]:
-                title = entry.find('atom:title', namespace)
-                summary = entry.find('atom:summary', namespace)
-                published = entry.find('atom:published', namespace)
-                authors = entry.findall('atom:author', namespace)
-                link = entry.find('atom:id', namespace)
-                
-                if summary is not None and summary.text:
-                    author_list = [author.find('atom:name', namespace).text for author in authors[:5] if author.find('atom:name', namespace) is not None]  # İlk 5 yazar
-                    abstract_text = summary.text.strip()
-                    # Abstract'i kısalt (600 karakter) - token tasarrufu
-                    abstract_short = abstract_text[:600] + "..." if len(abstract_text) > 600 else abstract_text
-                    
-                    articles.append({
-                        "source": "arxiv",
-                        "title_en": title.text if title is not None else "",
-                        "authors": author_list,
-                        "publication_date": published.text[:10] if published is not None else "",
-                        "abstract_en": abstract_short,
-                        "doi": None,
-                        "url": link.text if link is not None else "",
-                        "venue": "arXiv",
-                        "paper_id": entry.find('atom:id', namespace).text.split('/')[-1] if entry.find('atom:id', namespace) is not None else ""
-                    })
-            
-            return articles
-    
+        return await _search_source("arxiv", keyword, article_count, time_range_years, since)
     except Exception as e:
         print(f"arXiv arama hatası: {str(e)}")
         return []
@@ -162,59 +745,15 @@ async def search_arxiv(
 async def search_europe_pmc(
     keyword: str,
     article_count: int,
-    time_range_years: Optional[int] = None
+    time_range_years: Optional[int] = None,
+    since: Optional[str] = None
 ) -> List[Dict]:
     """
     Europe PMC API ile makale arama.
     Ücretsiz, API key gerektirmiyor.
     """
     try:
-        # Tarih filtresi
-        date_filter = ""
-        if time_range_years:
-            year = datetime.now().year - time_range_years
-            date_filter = f" AND PUB_YEAR:[{year} TO {datetime.now().year}]"
-        
-        params = {
-            "query": f"{keyword}{date_filter}",
-            "resultType": "core",
-            "pageSize": min(article_count, 100),
-            "format": "json"
-        }
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(EUROPE_PMC_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            articles = []
-            for result in data.get("resultList", {}).get("result", [])[:article_count]:
-                abstract_text = result.get("abstractText", "")
-                if abstract_text:
-                    authors = []
-                    if result.get("authorList", {}).get("author"):
-                        for author in result["authorList"]["author"][:5]:  # İlk 5 yazar
-                            name = f"{author.get('firstName', '')} {author.get('lastName', '')}".strip()
-                            if name:
-                                authors.append(name)
-                    
-                    # Abstract'i kısalt (600 karakter) - token tasarrufu
-                    abstract_short = abstract_text[:600] + "..." if len(abstract_text) > 600 else abstract_text
-                    
-                    articles.append({
-                        "source": "europe_pmc",
-                        "title_en": result.get("title", ""),
-                        "authors": authors,
-                        "publication_date": result.get("firstPublicationDate", "")[:10] if result.get("firstPublicationDate") else "",
-                        "abstract_en": abstract_short,
-                        "doi": result.get("doi"),
-                        "url": f"https://europepmc.org/article/MED/{result.get('pmid', '')}" if result.get("pmid") else result.get("fullTextUrlList", {}).get("fullTextUrl", [{}])[0].get("url", ""),
-                        "venue": result.get("journalTitle", ""),
-                        "paper_id": result.get("pmid") or result.get("id", "")
-                    })
-            
-            return articles
-    
+        return await _search_source("europe_pmc", keyword, article_count, time_range_years, since)
     except Exception as e:
         print(f"Europe PMC arama hatası: {str(e)}")
         return []
@@ -223,70 +762,137 @@ async def search_europe_pmc(
 async def search_doaj(
     keyword: str,
     article_count: int,
-    time_range_years: Optional[int] = None
+    time_range_years: Optional[int] = None,
+    since: Optional[str] = None
 ) -> List[Dict]:
     """
     DOAJ (Directory of Open Access Journals) API ile makale arama.
     Ücretsiz, API key gerektirmiyor.
     """
     try:
-        # Tarih filtresi
-        date_filter = ""
-        if time_range_years:
-            year = datetime.now().year - time_range_years
-            date_filter = f" AND year:[{year} TO {datetime.now().year}]"
-        
-        params = {
-            "q": f"{keyword}{date_filter}",
-            "pageSize": min(article_count, 100)
-        }
-        
-        async with httpx.AsyncClient(timeout=30.0) as client:
-            response = await client.get(DOAJ_API_URL, params=params)
-            response.raise_for_status()
-            data = response.json()
-            
-            articles = []
-            for result in data.get("results", [])[:article_count]:
-                abstract_text = result.get("bibjson", {}).get("abstract", "")
-                if abstract_text:
-                    authors = []
-                    if result.get("bibjson", {}).get("author"):
-                        for author in result["bibjson"]["author"][:5]:  # İlk 5 yazar
-                            if isinstance(author, dict):
-                                name = author.get("name", "")
-                            else:
-                                name = str(author)
-                            if name:
-                                authors.append(name)
-                    
-                    # Abstract'i kısalt (600 karakter) - token tasarrufu
-                    abstract_short = abstract_text[:600] + "..." if len(abstract_text) > 600 else abstract_text
-                    
-                    articles.append({
-                        "source": "doaj",
-                        "title_en": result.get("bibjson", {}).get("title", ""),
-                        "authors": authors,
-                        "publication_date": result.get("bibjson", {}).get("year", "") + "-01-01" if result.get("bibjson", {}).get("year") else "",
-                        "abstract_en": abstract_short,
-                        "doi": result.get("bibjson", {}).get("identifier", [{}])[0].get("id") if result.get("bibjson", {}).get("identifier") else None,
-                        "url": result.get("bibjson", {}).get("link", [{}])[0].get("url", "") if result.get("bibjson", {}).get("link") else "",
-                        "venue": result.get("bibjson", {}).get("journal", {}).get("title", ""),
-                        "paper_id": result.get("id", "")
-                    })
-            
-            return articles
-    
+        return await _search_source("doaj", keyword, article_count, time_range_years, since)
     except Exception as e:
         print(f"DOAJ arama hatası: {str(e)}")
         return []
 
 
+# Kaynak adı -> arama fonksiyonu (sıralama önceliği bu sıradır)
+SOURCE_SEARCHERS = {
+    "semantic_scholar": search_semantic_scholar,
+    "arxiv": search_arxiv,
+    "europe_pmc": search_europe_pmc,
+    "doaj": search_doaj
+}
+
+
+# Her kaynak için önden çekilip tamponda bekletilen maksimum makale; öncelikli
+# kaynak tüketilirken alt kaynaklar bu kadar ilerleyip bekler (bellek sabit kalır)
+SOURCE_BUFFER_SIZE = MAX_PAGE_SIZE
+
+# Kaynak akışının bittiğini bildiren işaret
+_SOURCE_DONE = object()
+
+
+async def stream_all_sources(
+    keyword: str,
+    article_count: int,
+    time_range_years: Optional[int] = None,
+    sources: Optional[List[str]] = None,
+    since: Optional[str] = None,
+    exclude: Optional[Callable[[Dict], bool]] = None,
+    scan_limit: Optional[int] = None
+) -> AsyncIterator[Dict]:
+    """
+    Tüm kaynaklarda paralel arama yap ve makaleleri sıralama sırasıyla akış halinde döndür.
+
+    Kaynaklar sayfa sayfa çekilir ve parse edildikçe sınırlı bir tampona
+    yazılır. Öncelikli kaynağın makaleleri geldikçe yayınlanır; alt öncelikli
+    kaynaklar, kendilerinden öncekiler bittiğinde sırayla yayınlanır. Böylece
+    nihai sıra / tekrar kaldırma search_all_sources ile aynı kalır, büyük
+    article_count değerlerinde (toplu export) bellek sabit kalır.
+
+    Args:
+        keyword: Aranacak anahtar kelime
+        article_count: Toplam alınacak makale sayısı
+        time_range_years: Son N yıl içindeki makaleler
+        sources: Kullanılacak kaynaklar listesi (None ise varsayılanlar kullanılır)
+        since: Sadece bu tarihten (YYYY-MM-DD) itibaren yayınlananlar (opsiyonel)
+        exclude: True döndürdüğü makaleler atlanır ve article_count'a sayılmaz (opsiyonel)
+        scan_limit: Kaynak başına taranacak maksimum kayıt (None ise article_count);
+            exclude ile atlanan kayıtların yerine yenilerinin bulunabilmesi için
+            article_count'tan büyük verilmelidir
+
+    Yields:
+        Tekrarları kaldırılmış makaleler (en fazla article_count adet)
+    """
+    if sources is None:
+        sources = DEFAULT_SOURCES
+
+    ordered_sources = [source for source in PAGE_FETCHERS if source in sources]
+    if not ordered_sources:
+        return
+
+    scan_limit = max(scan_limit or article_count, article_count)
+
+    async def pump(source: str, queue: asyncio.Queue) -> None:
+        try:
+            async with httpx.AsyncClient(timeout=30.0) as client:
+                articles = iter_source_articles(client, source, keyword, scan_limit, time_range_years, since)
+                produced = 0
+                try:
+                    async for article in articles:
+                        if exclude is not None and exclude(article):
+                            continue
+                        await queue.put(article)
+                        produced += 1
+                        if produced >= article_count:
+                            break
+                finally:
+                    await articles.aclose()
+        except Exception as e:
+            # Hata anına kadar gelen makaleler kullanılır
+            print(f"{source} arama hatası: {str(e)}")
+        await queue.put(_SOURCE_DONE)
+
+    queues = [asyncio.Queue(maxsize=SOURCE_BUFFER_SIZE) for _ in ordered_sources]
+    tasks = [
+        asyncio.create_task(pump(source, queue))
+        for source, queue in zip(ordered_sources, queues)
+    ]
+    released = 0
+    # Duplicate tespiti için kimliklerin hash'i tutulur (export'ta makale başına sabit, küçük maliyet)
+    seen = set()
+
+    try:
+        for queue in queues:
+            while released < article_count:
+                article = await queue.get()
+                if article is _SOURCE_DONE:
+                    break
+                # Duplicate'leri kaldır (DOI veya URL'ye göre)
+                identifier = article_identifier(article)
+                if identifier:
+                    key = hash(identifier)
+                    if key in seen:
+                        continue
+                    seen.add(key)
+                yield article
+                released += 1
+            if released >= article_count:
+                break
+    finally:
+        # İstenen sayıya ulaşıldıysa veya tüketici durduysa kalan aramaları iptal et
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+
 async def search_all_sources(
     keyword: str,
     article_count: int,
     time_range_years: Optional[int] = None,
-    sources: Optional[List[str]] = None
+    sources: Optional[List[str]] = None,
+    since: Optional[str] = None
 ) -> List[Dict]:
     """
     Tüm kaynaklardan paralel olarak makale arama.
@@ -296,49 +902,12 @@ async def search_all_sources(
         article_count: Toplam alınacak makale sayısı
         time_range_years: Son N yıl içindeki makaleler
         sources: Kullanılacak kaynaklar listesi (None ise hepsi kullanılır)
+        since: Sadece bu tarihten (YYYY-MM-DD) itibaren yayınlananlar (opsiyonel)
     
     Returns:
         Makale listesi
     """
-    if sources is None:
-        sources = ["arxiv", "europe_pmc", "doaj"]  # Semantic Scholar varsayılan olarak kapalı (API key gerektiriyor)
-    
-    tasks = []
-    
-    if "semantic_scholar" in sources:
-        tasks.append(search_semantic_scholar(keyword, article_count, time_range_years))
-    if "arxiv" in sources:
-        tasks.append(search_arxiv(keyword, article_count, time_range_years))
-    if "europe_pmc" in sources:
-        tasks.append(search_europe_pmc(keyword, article_count, time_range_years))
-    if "doaj" in sources:
-        tasks.append(search_doaj(keyword, article_count, time_range_years))
-    
-    if not tasks:
-        return []
-    
-    # Paralel olarak tüm kaynaklardan ara
-    results = await asyncio.gather(*tasks, return_exceptions=True)
-    
-    # Tüm sonuçları birleştir
-    all_articles = []
-    for result in results:
-        if isinstance(result, list):
-            all_articles.extend(result)
-        elif isinstance(result, Exception):
-            print(f"Arama hatası: {str(result)}")
-    
-    # Duplicate'leri kaldır (DOI veya URL'ye göre)
-    seen = set()
-    unique_articles = []
-    for article in all_articles:
-        identifier = article.get("doi") or article.get("url") or article.get("paper_id")
-        if identifier and identifier not in seen:
-            seen.add(identifier)
-            unique_articles.append(article)
-        elif not identifier:
-            unique_articles.append(article)
-    
-    # İstenen sayıya kadar sınırla
-    return unique_articles[:article_count]
-
+    return [
+        article
+        async for article in stream_all_sources(keyword, article_count, time_range_years, sources, since)
+    ]
@@ -0,0 +1,152 @@
+"""
+Analiz endpoint'i için kabul kontrolü (admission control) ve yük atma servisi.
+Aynı anda işlenen ve kuyrukta bekleyen makale sayısını ve istemci başına
+işi sınırlar; sınır aşıldığında istek beklemeden reddedilir.
+"""
+import asyncio
+from collections import Counter, deque
+from contextlib import asynccontextmanager
+from typing import Deque, Dict, List, Optional
+
+from config import (
+    ADMISSION_MAX_INFLIGHT_ARTICLES,
+    ADMISSION_MAX_QUEUED_ARTICLES,
+    ADMISSION_MAX_CLIENT_ARTICLES,
+    ADMISSION_QUEUE_TIMEOUT_SECONDS,
+    ADMISSION_RETRY_AFTER_SECONDS
+)
+
+
+class AdmissionRejected(Exception):
+    """İstek kapasite nedeniyle kabul edilmediğinde fırlatılır."""
+
+    def __init__(self, reason: str, retry_after: int = ADMISSION_RETRY_AFTER_SECONDS):
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after = retry_after
+
+
+class AdmissionController:
+    """
+    Makale sayısı üzerinden maliyet tabanlı kabul kontrolü.
+
+    Kapasite varsa ve kuyruk boşsa istek hemen kabul edilir; değilse kuyruk
+    sınırı içinde sırasını bekler. Kuyruk geliş sırasıyla (FIFO) işlenir:
+    baştaki istek sığmıyorsa arkasındaki küçük istekler de bekler, böylece
+    büyük istekler aç kalmaz. Kuyruk doluysa, istemci sınırı aşıldıysa
+    veya bekleme süresi dolarsa AdmissionRejected fırlatılır.
+    """
+
+    def __init__(
+        self,
+        max_inflight: int = ADMISSION_MAX_INFLIGHT_ARTICLES,
+        max_queued: int = ADMISSION_MAX_QUEUED_ARTICLES,
+        max_per_client: int = ADMISSION_MAX_CLIENT_ARTICLES,
+        queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SECONDS
+    ):
+        self.max_inflight = max_inflight
+        self.max_queued = max_queued
+        self.max_per_client = max_per_client
+        self.queue_timeout = queue_timeout
+        self.inflight = 0
+        self.queued = 0
+        self.admitted_total = 0
+        self.rejected: Counter = Counter()
+        self._per_client: Counter = Counter()
+        # Bekleyenler geliş sırasıyla: [maliyet, kabul edildiğinde çözülen future]
+        self._waiters: Deque[List] = deque()
+
+    def _grant_waiters(self) -> None:
+        # Sadece baştaki bekleyen kabul edilebilir; sığmıyorsa sıra korunur
+        while self._waiters:
+            cost, future = self._waiters[0]
+            if self.inflight + cost > self.max_inflight:
+                return
+            self._waiters.popleft()
+            self.queued -= cost
+            self.inflight += cost
+            future.set_result(None)
+
+    def _reject(self, reason: str) -> AdmissionRejected:
+        self.rejected[reason] += 1
+        return AdmissionRejected(reason)
+
+    @asynccontextmanager
+    async def admit(self, client_id: str, cost: int, timeout: Optional[float] = None):
+        """
+        İsteği kabul et; blok boyunca maliyeti kadar kapasite tutulur.
+
+        Args:
+            client_id: İstemci kimliği (IP adresi)
+            cost: İsteğin makale sayısı
+            timeout: Kuyrukta maksimum bekleme (None ise queue_timeout)
+        """
+        # Tek başına kapasiteden büyük istekler de tüm kapasiteyle çalışabilsin
+        cost = max(1, min(cost, self.max_inflight))
+        timeout = self.queue_timeout if timeout is None else min(timeout, self.queue_timeout)
+
+        if self._per_client[client_id] + cost > self.max_per_client:
+            raise self._reject("client_limit")
+
+        self._per_client[client_id] += cost
+        try:
+            # Kuyrukta bekleyen varken yeni gelenler sıra atlamasın
+            if self._waiters or self.inflight + cost > self.max_inflight:
+                if self.queued + cost > self.max_queued:
+                    raise self._reject("queue_full")
+
+                future = asyncio.get_running_loop().create_future()
+                waiter = [cost, future]
+                self._waiters.append(waiter)
+                self.queued += cost
+                try:
+                    await asyncio.wait_for(asyncio.shield(future), timeout=timeout)
+                except asyncio.TimeoutError:
+                    # Zaman aşımıyla aynı anda kabul edildiyse kapasite zaten ayrıldı
+                    if not future.done():
+                        self._abandon(waiter)
+                        raise self._reject("queue_timeout")
+                except asyncio.CancelledError:
+                    if future.done():
+                        self._release(cost)
+                    else:
+                        self._abandon(waiter)
+                    raise
+            else:
+                self.inflight += cost
+            self.admitted_total += 1
+
+            try:
+                yield
+            finally:
+                self._release(cost)
+        finally:
+            self._per_client[client_id] -= cost
+            if self._per_client[client_id] <= 0:
+                del self._per_client[client_id]
+
+    def _abandon(self, waiter: List) -> None:
+        self._waiters.remove(waiter)
+        self.queued -= waiter[0]
+        # Baştaki bekleyen çıktıysa arkasındakiler sığabilir
+        self._grant_waiters()
+
+    def _release(self, cost: int) -> None:
+        self.inflight -= cost
+        self._grant_waiters()
+
+    def stats(self) -> Dict:
+        return {
+            "inflight_articles": self.inflight,
+            "queued_articles": self.queued,
+            "max_inflight_articles": self.max_inflight,
+            "max_queued_articles": self.max_queued,
+            "active_clients": len(self._per_client),
+            "admitted_total": self.admitted_total,
+            "rejected_total": sum(self.rejected.values()),
+            "rejected_by_reason": dict(self.rejected)
+        }
+
+
+# Uygulama genelinde paylaşılan kabul kontrolcüsü
+admission_controller = AdmissionController()
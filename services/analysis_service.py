@@ -0,0 +1,200 @@
+"""
+Makale analiz servisi.
+Arama sonuçlarını NLP hattından (çeviri, özet, klinik çıkarım) geçirir.
+"""
+import asyncio
+from typing import List, Dict, Optional, AsyncIterable
+
+from models.schemas import ArticleResponse
+from services.academic_search_service import MIN_ABSTRACT_CHARS
+from services.budget_service import (
+    RequestBudget,
+    BudgetExceeded,
+    current_budget,
+    iterate_until_deadline,
+    translation_token_estimate,
+    TIER_FULL,
+    TIER_NO_TAKEAWAYS,
+    TIER_NO_SUMMARY,
+    TIER_TITLE_ONLY,
+    TIER_METADATA
+)
+from services.nlp_service import (
+    translate_to_turkish,
+    translate_full_text,
+    translate_title,
+    generate_summary,
+    extract_key_takeaways
+)
+
+# Bir makalenin NLP hattında harcadığı LLM çağrısı sayısı
+LLM_CALLS_PER_ARTICLE = 4
+
+
+def _build_response(article: Dict, tier: str, **translations) -> ArticleResponse:
+    return ArticleResponse(
+        pmid=article.get("paper_id", ""),  # paper_id kullan (pmid yerine)
+        title_en=article.get("title_en", ""),
+        authors=article.get("authors", []),
+        publication_date=article.get("publication_date", ""),
+        doi=article.get("doi"),
+        pubmed_url=article.get("url", ""),  # url kullan (pubmed_url yerine)
+        tier=tier,
+        **translations
+    )
+
+
+async def process_article(
+    article: Dict,
+    full_abstract: bool = False,
+    budget: Optional[RequestBudget] = None
+) -> Optional[ArticleResponse]:
+    """
+    Tek bir makaleyi NLP hattından geçir.
+
+    Bütçe daraldıkça sırasıyla çıkarımlar, özet ve abstract çevirisi bırakılır;
+    başlık da çevrilemezse sadece çevrilmemiş metadata döner. Kademeler istek
+    genelinde planlanır (bkz. RequestBudget). Hangi kademenin
+    verildiği ArticleResponse.tier alanında belirtilir.
+
+    Args:
+        article: search_all_sources'tan dönen makale sözlüğü
+        full_abstract: True ise abstract kısaltılmadan parçalı olarak tam çevrilir
+        budget: İstek bütçesi (None ise sınırsız)
+
+    Returns:
+        ArticleResponse veya abstract yetersizse None
+    """
+    abstract_en = article.get("abstract_en", "")
+
+    budget = budget or RequestBudget()
+    # Planlanan makale atlansa da payı serbest bırakılmalı
+    plan = budget.start_article()
+    budget_token = current_budget.set(budget)
+    try:
+        # Abstract boşsa atla
+        if not abstract_en or len(abstract_en.strip()) < MIN_ABSTRACT_CHARS:
+            return None
+
+        if full_abstract:
+            abstract_tr_task = translate_full_text(abstract_en)
+        else:
+            # Abstract'i kısalt (ilk 600 karakter) - token tasarrufu
+            abstract_en = abstract_en[:600] + "..." if len(abstract_en) > 600 else abstract_en
+            abstract_tr_task = translate_to_turkish(abstract_en)
+        # Çeviri maliyeti metin uzunluğuyla ölçeklenir
+        abstract_estimate = translation_token_estimate(len(abstract_en))
+
+        # Başlık ve abstract çevirisi paralel
+        title_tr, abstract_tr = await asyncio.gather(
+            plan.run_step("title", translate_title(article.get("title_en", ""))),
+            plan.run_step("abstract", abstract_tr_task, abstract_estimate),
+            return_exceptions=True
+        )
+        for result in (title_tr, abstract_tr):
+            if isinstance(result, Exception) and not isinstance(result, BudgetExceeded):
+                raise result
+
+        if isinstance(title_tr, BudgetExceeded):
+            return _build_response(article, TIER_METADATA)
+        if isinstance(abstract_tr, BudgetExceeded):
+            return _build_response(article, TIER_TITLE_ONLY, title_tr=title_tr)
+
+        # Özet oluştur (sadece abstract_tr kullan - token tasarrufu)
+        try:
+            summary_tr = await plan.run_step("summary", generate_summary("", abstract_tr))
+        except BudgetExceeded:
+            return _build_response(article, TIER_NO_SUMMARY, title_tr=title_tr, abstract_tr=abstract_tr)
+
+        # Klinik çıkarımları çıkar (sadece summary_tr kullan - token tasarrufu)
+        try:
+            key_takeaways_tr = await plan.run_step("takeaways", extract_key_takeaways("", "", summary_tr))
+        except BudgetExceeded:
+            return _build_response(
+                article, TIER_NO_TAKEAWAYS,
+                title_tr=title_tr, abstract_tr=abstract_tr, summary_tr=summary_tr
+            )
+
+        return _build_response(
+            article, TIER_FULL,
+            title_tr=title_tr,
+            abstract_tr=abstract_tr,
+            summary_tr=summary_tr,
+            key_takeaways_tr=key_takeaways_tr
+        )
+    finally:
+        plan.close()
+        current_budget.reset(budget_token)
+
+
+async def _process_article_safely(
+    article: Dict,
+    full_abstract: bool = False,
+    budget: Optional[RequestBudget] = None
+) -> Optional[ArticleResponse]:
+    try:
+        return await process_article(article, full_abstract, budget)
+    except Exception as e:
+        # Tek bir makale işlenirken hata oluşursa logla ve devam et
+        print(f"Uyarı: Makale işlenirken hata oluştu (ID: {article.get('paper_id', 'bilinmeyen')}): {str(e)}")
+        return None
+
+
+async def analyze_article_stream(
+    articles: AsyncIterable[Dict],
+    full_abstract: bool = False,
+    budget: Optional[RequestBudget] = None
+) -> List[ArticleResponse]:
+    """
+    Akış halinde gelen makaleleri geldikçe NLP hattına sok.
+    Arama ve NLP aşamaları örtüşür; sonuç sırası akış sırasıyla aynıdır.
+
+    Args:
+        articles: stream_all_sources çıktısı
+        full_abstract: True ise abstract'ler tam çevrilir
+        budget: İstek bütçesi; deadline dolduğunda akıştan yeni makale alınmaz
+
+    Returns:
+        İşlenmiş makale listesi
+    """
+    tasks = []
+    try:
+        async for article in iterate_until_deadline(articles, budget):
+            tasks.append(asyncio.create_task(_process_article_safely(article, full_abstract, budget)))
+        if budget is not None:
+            # Akış bitti; gelmeyen planlı makalelerin payı diğerlerine kalsın
+            budget.close_plan()
+        results = await asyncio.gather(*tasks)
+    finally:
+        # İstek iptal edilirse yarım kalan NLP görevlerini de iptal et
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+    return [result for result in results if result is not None]
+
+
+async def analyze_search_results(
+    articles_data: List[Dict],
+    full_abstract: bool = False,
+    budget: Optional[RequestBudget] = None
+) -> List[ArticleResponse]:
+    """
+    Arama sonuçlarını eşzamanlı işle; hatalı makaleleri logla ve atla.
+    Sonuç sırası girdi sırasıyla aynıdır.
+
+    Args:
+        articles_data: search_all_sources çıktısı
+        full_abstract: True ise abstract'ler tam çevrilir
+        budget: İstek bütçesi (None ise sınırsız)
+
+    Returns:
+        İşlenmiş makale listesi
+    """
+    if budget is not None:
+        budget.plan_articles(len(articles_data))
+    results = await asyncio.gather(*[
+        _process_article_safely(article, full_abstract, budget)
+        for article in articles_data
+    ])
+    return [result for result in results if result is not None]
@@ -0,0 +1,219 @@
+"""
+İstek başına gecikme/maliyet bütçesi servisi.
+Süre sınırı (deadline) ve token bütçesi daraldıkça NLP adımları tanımlı
+kademelerde (tier) bırakılır.
+"""
+import asyncio
+import time
+from contextvars import ContextVar
+from typing import AsyncIterable, AsyncIterator, Awaitable, Dict, Optional, Set, TypeVar
+
+T = TypeVar("T")
+
+# Kademeler - en yüksekten en düşüğe
+TIER_FULL = "full"
+TIER_NO_TAKEAWAYS = "no_takeaways"
+TIER_NO_SUMMARY = "no_summary"
+TIER_TITLE_ONLY = "title_only"
+TIER_METADATA = "metadata"
+
+# Adım başına tahmini token maliyeti (prompt + çıktı)
+STEP_TOKEN_ESTIMATES = {
+    "title": 80,
+    "abstract": 430,  # 600 karakterlik abstract için translation_token_estimate
+    "summary": 350,
+    "takeaways": 300
+}
+
+# Adımların kademe sırası: bir adım, isteğin tüm makaleleri için kendinden
+# önceki adımlara yetecek bütçe bırakmıyorsa rezerve edilmez
+STEP_ORDER = ["title", "abstract", "summary", "takeaways"]
+
+
+def translation_token_estimate(chars: int) -> int:
+    """Çeviri çağrısının tahmini token maliyeti (sabit prompt + girdi + Türkçe çıktı)."""
+    return 40 + int(chars * 0.65)
+
+# Kalan süre bunun altındaysa yeni LLM adımı başlatılmaz (saniye)
+MIN_STEP_SECONDS = 0.5
+
+# Aktif isteğin bütçesi - nlp_service gerçek token kullanımını buraya yazar
+current_budget: ContextVar[Optional["RequestBudget"]] = ContextVar("current_budget", default=None)
+
+
+class BudgetExceeded(Exception):
+    """Bir NLP adımı için bütçe (süre veya token) kalmadığında fırlatılır."""
+
+
+class RequestBudget:
+    """
+    Tek bir isteğin süre ve token bütçesi.
+
+    Eşzamanlı makaleler aynı bütçeyi paylaşır; her adım başlamadan önce
+    tahmini maliyetini rezerve eder, bitince gerçek kullanım yazılır ve
+    rezervasyon iade edilir. Kademeler istek genelinde planlanır: bir adım,
+    henüz rezerve edilmemiş daha önemli adımların (tüm makaleler için)
+    tahmini maliyeti kadar bütçeyi geride bırakmalıdır. Böylece önce bütün
+    makalelerin çıkarımları, sonra özetleri bırakılır.
+    """
+
+    def __init__(self, deadline_ms: Optional[int] = None, token_budget: Optional[int] = None):
+        self.deadline = time.monotonic() + deadline_ms / 1000 if deadline_ms else None
+        self.tokens_remaining = token_budget
+        self.tokens_used = 0
+        # Adım -> o adımı henüz rezerve etmemiş makale sayısı (planlananlar dahil)
+        self._unreserved: Dict[str, int] = {step: 0 for step in STEP_ORDER}
+        # Planlanan ama henüz işlenmeye başlamamış makaleler
+        self._unstarted = 0
+        # Bir makale için bütçe yetmeyen en düşük adım; diğer makaleler bundan
+        # sonraki adımları da alamaz (kademeler istek genelinde tutarlı kalır)
+        self._denied_from: Optional[int] = None
+
+    @property
+    def unlimited(self) -> bool:
+        return self.deadline is None and self.tokens_remaining is None
+
+    def remaining_seconds(self) -> Optional[float]:
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+
+    def plan_articles(self, count: int) -> None:
+        """İstekte işlenecek makale sayısını önceden bildir (kademeler bu sayıya göre planlanır)."""
+        self._unstarted += count
+        for step in STEP_ORDER:
+            self._unreserved[step] += count
+
+    def close_plan(self) -> None:
+        """Makale akışı bitti; hiç gelmeyen planlı makalelerin payını serbest bırak."""
+        for step in STEP_ORDER:
+            self._unreserved[step] -= self._unstarted
+        self._unstarted = 0
+
+    def start_article(self) -> "ArticlePlan":
+        if self._unstarted > 0:
+            self._unstarted -= 1
+        else:
+            for step in STEP_ORDER:
+                self._unreserved[step] += 1
+        return ArticlePlan(self)
+
+    def floor(self, step: str, own_pending: Set[str]) -> int:
+        """Adımdan önce gelen ve diğer makalelerce henüz rezerve edilmemiş adımların tahmini maliyeti."""
+        total = 0
+        for lower in STEP_ORDER[:STEP_ORDER.index(step)]:
+            others = self._unreserved[lower] - (1 if lower in own_pending else 0)
+            total += max(0, others) * STEP_TOKEN_ESTIMATES[lower]
+        return total
+
+    def reserve(self, tokens: int, floor: int = 0) -> bool:
+        """
+        Adım için tahmini token ve asgari süre ayır; yetmiyorsa False döner.
+        floor: rezervasyondan sonra geride kalması gereken token miktarı
+        """
+        remaining = self.remaining_seconds()
+        if remaining is not None and remaining < MIN_STEP_SECONDS:
+            return False
+        if self.tokens_remaining is not None:
+            if tokens + floor > self.tokens_remaining:
+                return False
+            self.tokens_remaining -= tokens
+        return True
+
+    def release(self, tokens: int) -> None:
+        """Rezervasyonu iade et (gerçek kullanım charge ile ayrıca düşülür)."""
+        if self.tokens_remaining is not None:
+            self.tokens_remaining += tokens
+
+    def charge(self, tokens: int) -> None:
+        self.tokens_used += tokens
+        if self.tokens_remaining is not None:
+            self.tokens_remaining -= tokens
+
+    async def run_step(
+        self,
+        step: str,
+        coro: Awaitable[T],
+        estimate: Optional[int] = None,
+        floor: int = 0
+    ) -> T:
+        """
+        NLP adımını bütçe içinde çalıştır.
+
+        Args:
+            step: STEP_TOKEN_ESTIMATES anahtarı
+            coro: Çalıştırılacak NLP çağrısı
+            estimate: Varsayılan token tahmini yerine kullanılacak değer (örn. tam abstract)
+            floor: Rezervasyondan sonra geride kalması gereken token miktarı
+
+        Raises:
+            BudgetExceeded: Token/süre yetmiyorsa veya deadline adım sırasında dolduysa
+        """
+        if estimate is None:
+            estimate = STEP_TOKEN_ESTIMATES.get(step, 0)
+        rank = STEP_ORDER.index(step) if step in STEP_ORDER else None
+        denied = self._denied_from is not None and rank is not None and rank > self._denied_from
+        if denied or not self.reserve(estimate, floor):
+            if rank is not None and (self._denied_from is None or rank < self._denied_from):
+                self._denied_from = rank
+            # Başlatılmayan coroutine için "never awaited" uyarısını önle
+            if asyncio.iscoroutine(coro):
+                coro.close()
+            raise BudgetExceeded(step)
+
+        try:
+            return await asyncio.wait_for(coro, timeout=self.remaining_seconds())
+        except asyncio.TimeoutError:
+            raise BudgetExceeded(step)
+        finally:
+            self.release(estimate)
+
+
+class ArticlePlan:
+    """
+    Tek bir makalenin istek bütçesi içindeki planı.
+    Bir adım denendiği anda (başarılı veya bütçe yetmedi) diğer makalelerin
+    taban hesabından düşer; close() denenmemiş adımları serbest bırakır.
+    """
+
+    def __init__(self, budget: RequestBudget):
+        self.budget = budget
+        self.pending: Set[str] = set(STEP_ORDER)
+
+    def _mark_reserved(self, step: str) -> None:
+        if step in self.pending:
+            self.pending.discard(step)
+            self.budget._unreserved[step] -= 1
+
+    async def run_step(self, step: str, coro: Awaitable[T], estimate: Optional[int] = None) -> T:
+        floor = self.budget.floor(step, self.pending)
+        # Hesap ve rezervasyon arasında başka görev çalışmaz (run_step ilk await'e kadar senkron)
+        self._mark_reserved(step)
+        return await self.budget.run_step(step, coro, estimate, floor)
+
+    def close(self) -> None:
+        for step in list(self.pending):
+            self._mark_reserved(step)
+
+
+def charge_current_budget(tokens: int) -> None:
+    """Aktif isteğin bütçesinden gerçek token kullanımını düş."""
+    budget = current_budget.get()
+    if budget is not None:
+        budget.charge(tokens)
+
+
+async def iterate_until_deadline(items: AsyncIterable[T], budget: Optional[RequestBudget]) -> AsyncIterator[T]:
+    """Akışı deadline dolana kadar tüket; dolduğunda o ana kadar gelenlerle yetin."""
+    iterator = items.__aiter__()
+    try:
+        while True:
+            timeout = budget.remaining_seconds() if budget is not None else None
+            try:
+                item = await asyncio.wait_for(iterator.__anext__(), timeout=timeout)
+            except (StopAsyncIteration, asyncio.TimeoutError):
+                return
+            yield item
+    finally:
+        if hasattr(iterator, "aclose"):
+            await iterator.aclose()
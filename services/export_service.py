@@ -0,0 +1,167 @@
+"""
+Analiz edilmiş makalelerin toplu dışa aktarımı (JSONL / Parquet).
+Makaleler üretildikçe akış halinde yazılır; bellekte kaynak başına bir
+tampon, analiz edilen bir grup ve bir Parquet row group'u tutulur. Tekrar
+tespiti için makale başına sadece kimlik hash'i saklanır.
+"""
+import asyncio
+from typing import AsyncIterator, Dict, List, Optional
+
+from config import (
+    EXPORT_MAX_ARTICLES,
+    EXPORT_PAGE_SIZE,
+    EXPORT_CONCURRENCY,
+    EXPORT_ROW_GROUP_SIZE
+)
+from models.schemas import ArticleResponse
+from services.academic_search_service import stream_all_sources
+from services.analysis_service import process_article
+
+# Parquet opsiyonel bağımlılıktır (pip install pyarrow)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Art arda bu kadar grubun hiçbir makalesi işlenemezse export sonlanır
+MAX_EMPTY_PAGES = 3
+
+
+async def _analyze_page(articles: List[Dict], full_abstract: bool, semaphore: asyncio.Semaphore) -> List[Optional[ArticleResponse]]:
+    async def analyze(article: Dict) -> Optional[ArticleResponse]:
+        async with semaphore:
+            try:
+                return await process_article(article, full_abstract)
+            except Exception as e:
+                print(f"Uyarı: Makale işlenirken hata oluştu (ID: {article.get('paper_id', 'bilinmeyen')}): {str(e)}")
+                return None
+
+    return await asyncio.gather(*[analyze(article) for article in articles])
+
+
+async def iter_analyzed_articles(
+    keyword: str,
+    max_articles: int,
+    time_range_years: Optional[int] = None,
+    full_abstract: bool = False
+) -> AsyncIterator[ArticleResponse]:
+    """
+    Kaynakları çok sayfalı akışla gez ve işlenen makaleleri sırayla üret.
+    Makaleler EXPORT_PAGE_SIZE'lık gruplar halinde analiz edilir; bir grup
+    analiz edilirken kaynak akışı sonraki sayfaları arka planda çeker.
+
+    Args:
+        keyword: Aranacak anahtar kelime
+        max_articles: Üretilecek maksimum makale sayısı
+        time_range_years: Son N yıl içindeki makaleler
+        full_abstract: True ise abstract'ler tam çevrilir
+
+    Yields:
+        İşlenmiş makaleler
+    """
+    max_articles = min(max_articles, EXPORT_MAX_ARTICLES)
+    semaphore = asyncio.Semaphore(EXPORT_CONCURRENCY)
+    articles = stream_all_sources(keyword, max_articles, time_range_years)
+
+    empty_pages = 0
+    group: List[Dict] = []
+    try:
+        async for article in articles:
+            group.append(article)
+            if len(group) < EXPORT_PAGE_SIZE:
+                continue
+
+            page_results = 0
+            for result in await _analyze_page(group, full_abstract, semaphore):
+                if result is not None:
+                    page_results += 1
+                    yield result
+            group = []
+
+            empty_pages = 0 if page_results else empty_pages + 1
+            if empty_pages >= MAX_EMPTY_PAGES:
+                return
+
+        for result in await _analyze_page(group, full_abstract, semaphore):
+            if result is not None:
+                yield result
+    finally:
+        await articles.aclose()
+
+
+async def iter_jsonl(
+    keyword: str,
+    max_articles: int,
+    time_range_years: Optional[int] = None,
+    full_abstract: bool = False
+) -> AsyncIterator[bytes]:
+    """HTTP chunked yanıtı için her makaleyi tek satırlık JSON olarak üret."""
+    async for article in iter_analyzed_articles(keyword, max_articles, time_range_years, full_abstract):
+        yield (article.model_dump_json() + "\n").encode("utf-8")
+
+
+async def write_jsonl(
+    path: str,
+    keyword: str,
+    max_articles: int,
+    time_range_years: Optional[int] = None,
+    full_abstract: bool = False
+) -> int:
+    """Makaleleri üretildikçe JSONL dosyasına yaz; yazılan makale sayısını döndür."""
+    count = 0
+    with open(path, "w", encoding="utf-8") as f:
+        async for article in iter_analyzed_articles(keyword, max_articles, time_range_years, full_abstract):
+            f.write(article.model_dump_json() + "\n")
+            count += 1
+    return count
+
+
+def _parquet_schema():
+    text_list = pa.list_(pa.string())
+    return pa.schema([
+        ("pmid", pa.string()),
+        ("title_en", pa.string()),
+        ("title_tr", pa.string()),
+        ("authors", text_list),
+        ("publication_date", pa.string()),
+        ("doi", pa.string()),
+        ("pubmed_url", pa.string()),
+        ("abstract_tr", pa.string()),
+        ("summary_tr", pa.string()),
+        ("key_takeaways_tr", text_list),
+        ("tier", pa.string())
+    ])
+
+
+async def write_parquet(
+    path: str,
+    keyword: str,
+    max_articles: int,
+    time_range_years: Optional[int] = None,
+    full_abstract: bool = False,
+    row_group_size: int = EXPORT_ROW_GROUP_SIZE
+) -> int:
+    """
+    Makaleleri Parquet dosyasına row group'lar halinde yaz.
+    Bellekte en fazla bir row group kadar satır tutulur.
+    """
+    if pa is None:
+        raise RuntimeError("Parquet export için pyarrow gerekli: pip install pyarrow")
+
+    schema = _parquet_schema()
+    rows: List[Dict] = []
+    count = 0
+
+    with pq.ParquetWriter(path, schema) as writer:
+        async for article in iter_analyzed_articles(keyword, max_articles, time_range_years, full_abstract):
+            rows.append(article.model_dump())
+            count += 1
+            if len(rows) >= row_group_size:
+                writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+                rows = []
+        if rows:
+            writer.write_table(pa.Table.from_pylist(rows, schema=schema))
+
+    return count
@@ -0,0 +1,169 @@
+"""
+Tıbbi terim sözlüğü ve başlık çeviri hızlı yolu.
+İngilizce -> Türkçe terim sözlüğünü dosyadan yükler ve indeksler; daha önce
+çevrilmiş başlıkları birebir eşleşmeyle cache'ten döndürür. Tamamı sözlükle
+karşılanan başlıklar LLM'e gönderilmeden çevrilir, diğerleri için ilgili
+terimler prompt'a eklenir.
+"""
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+
+from config import GLOSSARY_PATH, TITLE_CACHE_SIZE, GLOSSARY_PROMPT_MAX_TERMS
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+(?:['\-][a-z0-9]+)*")
+# Başlığı bölen ayraçlar; sıralama korunarak Türkçe karşılıklarıyla birleştirilir
+_SEPARATOR_PATTERN = re.compile(r"\s*([:;,])\s*|\s+(and|or)\s+", re.IGNORECASE)
+_SEPARATORS_TR = {":": ": ", ";": "; ", ",": ", ", "and": " ve ", "or": " veya "}
+# Bölüm başındaki artikeller kapsama hesabında yok sayılır ("A systematic review")
+_ARTICLES = {"a", "an", "the"}
+
+
+def _tokens(text: str) -> Tuple[str, ...]:
+    return tuple(_TOKEN_PATTERN.findall(text.lower()))
+
+
+def normalize_title(title: str) -> str:
+    """Başlık cache anahtarı: küçük harf, tek boşluk, sondaki nokta olmadan."""
+    return " ".join(title.lower().split()).rstrip(". ")
+
+
+def _capitalize_tr(text: str) -> str:
+    # Türkçe'de "i" büyük harfi "İ" olur
+    if not text:
+        return text
+    first = "İ" if text[0] == "i" else text[0].upper()
+    return first + text[1:]
+
+
+class MedicalGlossary:
+    """
+    Terim sözlüğü (token dizisi -> Türkçe karşılık) ve başlık cache'i.
+
+    Terimler token dizisiyle indekslenir; başlık içindeki terimler en uzun
+    eşleşme önceliğiyle bulunur. Başlık cache'i LRU olarak sınırlıdır.
+    """
+
+    def __init__(self, terms: Optional[Dict[str, str]] = None, cache_size: int = TITLE_CACHE_SIZE):
+        self.terms: Dict[Tuple[str, ...], str] = {}
+        self.max_term_tokens = 0
+        self.cache_size = cache_size
+        self._title_cache: "OrderedDict[str, str]" = OrderedDict()
+        for english, turkish in (terms or {}).items():
+            self.add_term(english, turkish)
+
+    @classmethod
+    def load(cls, path: str = GLOSSARY_PATH) -> "MedicalGlossary":
+        """Sekmeyle ayrılmış 'ingilizce<TAB>türkçe' dosyasından sözlük yükle."""
+        glossary = cls()
+        if not os.path.exists(path):
+            print(f"Uyarı: Tıbbi sözlük dosyası bulunamadı: {path}")
+            return glossary
+
+        with open(path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, 1):
+                line = line.strip()
+                if not line or line.startswith("#"):
+                    continue
+                parts = line.split("\t")
+                if len(parts) != 2 or not parts[0].strip() or not parts[1].strip():
+                    print(f"Uyarı: Sözlük satırı okunamadı ({path}:{line_no})")
+                    continue
+                glossary.add_term(parts[0], parts[1])
+        return glossary
+
+    def add_term(self, english: str, turkish: str) -> None:
+        key = _tokens(english)
+        if key:
+            self.terms[key] = turkish.strip()
+            self.max_term_tokens = max(self.max_term_tokens, len(key))
+
+    def find_terms(self, text: str) -> List[Tuple[str, str]]:
+        """Metindeki sözlük terimlerini en uzun eşleşme önceliğiyle bul."""
+        tokens = _tokens(text)
+        found = []
+        i = 0
+        while i < len(tokens):
+            for length in range(min(self.max_term_tokens, len(tokens) - i), 0, -1):
+                key = tokens[i:i + length]
+                if key in self.terms:
+                    found.append((" ".join(key), self.terms[key]))
+                    i += length
+                    break
+            else:
+                i += 1
+        return found
+
+    def prompt_terms(self, title: str) -> List[Tuple[str, str]]:
+        """Çeviri prompt'una eklenecek, tekrarsız terim eşleşmeleri."""
+        unique = list(OrderedDict.fromkeys(self.find_terms(title)))
+        return unique[:GLOSSARY_PROMPT_MAX_TERMS]
+
+    def translate_covered(self, title: str) -> Optional[str]:
+        """
+        Başlığın her bölümü tek bir sözlük terimiyse çeviriyi sözlükten kur.
+        Türkçe'de kelime sırası değiştiği için kısmi kapsanan başlıklar None döner.
+        """
+        parts = _SEPARATOR_PATTERN.split(title.strip().rstrip("."))
+        segments = parts[::3]
+        separators = [punct or conj for punct, conj in zip(parts[1::3], parts[2::3])]
+
+        translated = []
+        for index, segment in enumerate(segments):
+            key = _tokens(segment)
+            if key and key[0] in _ARTICLES:
+                key = key[1:]
+            if key not in self.terms:
+                return None
+            turkish = self.terms[key]
+            # Başlık ve iki noktadan sonraki bölüm büyük harfle başlar
+            if index == 0 or separators[index - 1] == ":":
+                turkish = _capitalize_tr(turkish)
+            translated.append(turkish)
+
+        result = translated[0]
+        for separator, turkish in zip(separators, translated[1:]):
+            result += _SEPARATORS_TR[separator.lower()] + turkish
+        return result
+
+    def get_cached(self, title: str) -> Optional[str]:
+        key = normalize_title(title)
+        translation = self._title_cache.get(key)
+        if translation is not None:
+            self._title_cache.move_to_end(key)
+        return translation
+
+    def remember(self, title: str, translation: str) -> None:
+        key = normalize_title(title)
+        self._title_cache[key] = translation
+        self._title_cache.move_to_end(key)
+        while len(self._title_cache) > self.cache_size:
+            self._title_cache.popitem(last=False)
+
+    def fast_translate(self, title: str) -> Tuple[Optional[str], str]:
+        """
+        LLM'siz çeviri dene.
+
+        Returns:
+            (çeviri veya None, kaynak) - kaynak "cache", "glossary" veya "miss"
+        """
+        cached = self.get_cached(title)
+        if cached is not None:
+            return cached, "cache"
+        covered = self.translate_covered(title)
+        if covered is not None:
+            self.remember(title, covered)
+            return covered, "glossary"
+        return None, "miss"
+
+
+# Uygulama genelinde paylaşılan sözlük (ilk kullanımda yüklenir)
+_glossary: Optional[MedicalGlossary] = None
+
+
+def get_glossary() -> MedicalGlossary:
+    global _glossary
+    if _glossary is None:
+        _glossary = MedicalGlossary.load()
+    return _glossary
@@ -0,0 +1,186 @@
+"""
+Event loop gecikme izleme ve istek bazlı örnekleme profili servisi.
+Senkron (bloklayan) çağrıların event loop'u durdurduğu anları yakalar.
+"""
+import asyncio
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import Counter
+from contextlib import asynccontextmanager
+from datetime import datetime
+from typing import Dict, Optional
+
+from config import (
+    LOOP_LAG_THRESHOLD_MS,
+    LOOP_LAG_CHECK_INTERVAL_MS,
+    PROFILE_OUTPUT_DIR,
+    PROFILE_SAMPLE_INTERVAL_MS
+)
+
+
+def _format_stack(frame) -> str:
+    return "".join(traceback.format_stack(frame))
+
+
+def _folded_stack(frame) -> str:
+    """Frame'i flamegraph araçlarının okuduğu 'a;b;c' biçimine çevir (kökten yaprağa)."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return ";".join(reversed(names))
+
+
+class LoopLagMonitor:
+    """
+    Event loop'un bloke olduğu anları tespit eder.
+
+    Loop içindeki bir görev düzenli olarak kalp atışı yazar; ayrı bir izleme
+    thread'i kalp atışı eşikten uzun süre gelmezse loop thread'inin o anki
+    stack'ini alıp uyarı olarak loglar. Böylece bloklayan kodun kendisi görülür.
+    """
+
+    def __init__(
+        self,
+        threshold_ms: int = LOOP_LAG_THRESHOLD_MS,
+        check_interval_ms: int = LOOP_LAG_CHECK_INTERVAL_MS
+    ):
+        self.threshold = threshold_ms / 1000
+        self.check_interval = check_interval_ms / 1000
+        self.max_lag_ms = 0.0
+        self.blocked_count = 0
+        self._last_beat = time.monotonic()
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat_task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def start(self) -> None:
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._heartbeat_task = asyncio.create_task(self._heartbeat())
+        self._watchdog = threading.Thread(target=self._watch, name="loop-lag-watchdog", daemon=True)
+        self._watchdog.start()
+
+    async def stop(self) -> None:
+        self._stop.set()
+        if self._heartbeat_task is not None:
+            self._heartbeat_task.cancel()
+            await asyncio.gather(self._heartbeat_task, return_exceptions=True)
+        if self._watchdog is not None:
+            self._watchdog.join(timeout=1)
+
+    async def _heartbeat(self) -> None:
+        while True:
+            expected = time.monotonic() + self.check_interval
+            await asyncio.sleep(self.check_interval)
+            now = time.monotonic()
+            self._last_beat = now
+            self.max_lag_ms = max(self.max_lag_ms, (now - expected) * 1000)
+
+    def _watch(self) -> None:
+        reported_beat = None
+        while not self._stop.wait(self.check_interval):
+            last_beat = self._last_beat
+            blocked_for = time.monotonic() - last_beat
+            # Aynı bloklama için tek uyarı
+            if blocked_for < self.threshold or last_beat == reported_beat:
+                continue
+
+            reported_beat = last_beat
+            self.blocked_count += 1
+            frame = sys._current_frames().get(self._loop_thread_id)
+            stack = _format_stack(frame) if frame is not None else "(stack alınamadı)\n"
+            print(
+                f"Uyarı: Event loop {blocked_for * 1000:.0f} ms'dir bloke "
+                f"(eşik {self.threshold * 1000:.0f} ms). Bloklayan stack:\n{stack}"
+            )
+
+    def stats(self) -> Dict:
+        return {
+            "threshold_ms": self.threshold * 1000,
+            "max_lag_ms": round(self.max_lag_ms, 1),
+            "blocked_count": self.blocked_count
+        }
+
+
+class SamplingProfiler:
+    """
+    Belirli bir thread'in stack'ini sabit aralıklarla örnekleyen basit profil aracı.
+    Çıktı, flamegraph.pl / speedscope ile açılabilen 'folded stack' formatındadır.
+    """
+
+    def __init__(self, thread_id: int, interval_ms: int = PROFILE_SAMPLE_INTERVAL_MS):
+        self.thread_id = thread_id
+        self.interval = interval_ms / 1000
+        self.samples: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        self._thread = threading.Thread(target=self._sample, name="sampling-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.samples[_folded_stack(frame)] += 1
+
+    def write(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+# Profili alınacak kalan istek sayısı (admin tarafından ayarlanır)
+_profile_requests_remaining = 0
+
+
+def arm_profiling(request_count: int) -> None:
+    """Sonraki N analiz isteğinin profilini al."""
+    global _profile_requests_remaining
+    _profile_requests_remaining = request_count
+
+
+def profiling_remaining() -> int:
+    return _profile_requests_remaining
+
+
+@asynccontextmanager
+async def profile_request(name: str):
+    """
+    Profil alma açıksa isteği örnekle ve sonucu PROFILE_OUTPUT_DIR altına yaz.
+    Örnekler loop thread'inden alınır; aynı anda çalışan diğer istekler de
+    profilde görünür.
+    """
+    global _profile_requests_remaining
+    if _profile_requests_remaining <= 0:
+        yield
+        return
+
+    _profile_requests_remaining -= 1
+    profiler = SamplingProfiler(threading.get_ident())
+    profiler.start()
+    try:
+        yield
+    finally:
+        profiler.stop()
+        timestamp = datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = os.path.join(PROFILE_OUTPUT_DIR, f"{name}-{timestamp}.folded")
+        try:
+            profiler.write(path)
+            print(f"Profil yazıldı: {path} ({sum(profiler.samples.values())} örnek)")
+        except OSError as e:
+            print(f"Uyarı: Profil yazılamadı: {str(e)}")
@@ -2,13 +2,181 @@
 NLP işlemleri için servis modülü.
 OpenAI API kullanarak çeviri, özet ve klinik çıkarım işlemlerini yönetir.
 """
-from typing import List
+import asyncio
+import json
+import re
+from typing import Callable, List, Optional, Tuple
 import openai
-from config import OPENAI_API_KEY
+from config import (
+    OPENAI_API_KEY,
+    FULL_TEXT_CONCURRENCY,
+    NLP_BATCH_ENABLED,
+    NLP_BATCH_WINDOW_MS,
+    NLP_BATCH_MAX_ITEMS,
+    NLP_BATCH_ABSTRACT_MAX_CHARS
+)
+from services.budget_service import RequestBudget, charge_current_budget, current_budget
+from services.glossary_service import get_glossary
 
 # OpenAI client'ı başlat
 openai.api_key = OPENAI_API_KEY
 
+# Paylaşılan asenkron client - senkron çağrılar event loop'u bloke ediyordu
+# (arka plan ön ısıtma aynı loop üzerinde çalışır)
+async_client = openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+
+def _record_usage(response) -> None:
+    """Yanıtın token kullanımını aktif istek bütçesine yaz."""
+    usage = getattr(response, "usage", None)
+    if usage is not None:
+        charge_current_budget(usage.total_tokens)
+
+
+def _parse_json_list(content: str, expected: int) -> Optional[List[str]]:
+    """Yanıttaki JSON string dizisini çöz; eleman sayısı tutmuyorsa None döner."""
+    start, end = content.find("["), content.rfind("]")
+    if start < 0 or end < start:
+        return None
+    try:
+        items = json.loads(content[start:end + 1])
+    except ValueError:
+        return None
+    if not isinstance(items, list) or len(items) != expected:
+        return None
+    if not all(isinstance(item, str) and item.strip() for item in items):
+        return None
+    return [item.strip() for item in items]
+
+
+class _MicroBatcher:
+    """
+    Farklı makalelerden gelen kısa çeviri isteklerini birkaç milisaniye toplayıp
+    tek LLM çağrısında JSON dizisi olarak çevirir.
+
+    Her çağırana kendi sonucu döner; yanıt hizalanamazsa veya çağrı başarısız
+    olursa None döner ve çağıran tekil çağrıya geri düşer. Token kullanımı
+    metin uzunluğuna göre bölünerek her çağıranın kendi bütçesine yazılır.
+    """
+
+    def __init__(
+        self,
+        system_prompt: str,
+        tokens_per_item: int,
+        context: Optional[Callable[[List[str]], str]] = None,
+        window_ms: int = NLP_BATCH_WINDOW_MS,
+        max_items: int = NLP_BATCH_MAX_ITEMS
+    ):
+        self.system_prompt = system_prompt
+        self.tokens_per_item = tokens_per_item
+        self.context = context
+        self.window = window_ms / 1000
+        self.max_items = max_items
+        self._pending: List[Tuple[str, asyncio.Future, Optional[RequestBudget]]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: set = set()
+
+    async def submit(self, text: str) -> Optional[str]:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future, current_budget.get()))
+        if len(self._pending) >= self.max_items:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending = self._pending, []
+        if batch:
+            task = asyncio.create_task(self._run(batch))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, batch: List[Tuple[str, asyncio.Future, Optional[RequestBudget]]]) -> None:
+        # Bu arada iptal edilen çağıranlar için çeviri yapılmaz
+        batch = [item for item in batch if not item[1].done()]
+        if not batch:
+            return
+        # Tek öğe için batch prompt'u gereksiz; çağıran tekil çağrıyı yapar
+        if len(batch) == 1:
+            batch[0][1].set_result(None)
+            return
+
+        texts = [text for text, _, _ in batch]
+        translations = None
+        try:
+            translations = await self._translate(texts, [budget for _, _, budget in batch])
+            if translations is None:
+                print(f"Uyarı: Batch çeviri yanıtı hizalanamadı ({len(texts)} öğe), tekil çağrılara dönülüyor")
+        except Exception as e:
+            print(f"Uyarı: Batch çeviri hatası ({len(texts)} öğe), tekil çağrılara dönülüyor: {str(e)}")
+
+        for index, (_, future, _) in enumerate(batch):
+            if not future.done():
+                future.set_result(translations[index] if translations else None)
+
+    async def _translate(self, texts: List[str], budgets: List[Optional[RequestBudget]]) -> Optional[List[str]]:
+        system_prompt = self.system_prompt
+        if self.context is not None:
+            system_prompt += self.context(texts)
+
+        response = await async_client.chat.completions.create(
+            model="gpt-3.5-turbo",
+            messages=[
+                {
+                    "role": "system",
+                    "content": system_prompt
+                },
+                {
+                    "role": "user",
+                    "content": json.dumps(texts, ensure_ascii=False)
+                }
+            ],
+            temperature=0.2,
+            max_tokens=self.tokens_per_item * len(texts)
+        )
+
+        # Kullanımı metin uzunluğuna göre çağıranların bütçelerine böl
+        usage = getattr(response, "usage", None)
+        if usage is not None:
+            total_chars = sum(len(text) for text in texts) or 1
+            for text, budget in zip(texts, budgets):
+                if budget is not None:
+                    budget.charge(round(usage.total_tokens * len(text) / total_chars))
+
+        return _parse_json_list(response.choices[0].message.content, len(texts))
+
+
+_BATCH_FORMAT = (
+    " Girdi bir JSON string dizisidir. Çevirileri aynı sırayla ve aynı sayıda, "
+    "sadece JSON string dizisi olarak döndür."
+)
+
+
+def _title_batch_context(titles: List[str]) -> str:
+    terms = []
+    for title in titles:
+        terms.extend(get_glossary().prompt_terms(title))
+    terms = list(dict.fromkeys(terms))
+    if not terms:
+        return ""
+    return " Terimler: " + "; ".join(f"{en}={tr}" for en, tr in terms)
+
+
+_title_batcher = _MicroBatcher(
+    "Tıbbi başlıkları çevir. Her başlığın sadece kısa çevirisini yaz." + _BATCH_FORMAT,
+    tokens_per_item=60,
+    context=_title_batch_context
+)
+_abstract_batcher = _MicroBatcher(
+    "Tıbbi çevirmen. Her metni kısa, öz çevir." + _BATCH_FORMAT,
+    tokens_per_item=250
+)
+
 
 async def translate_to_turkish(text: str) -> str:
     """
@@ -17,10 +185,14 @@ async def translate_to_turkish(text: str) -> str:
     try:
         # Abstract'i kısalt (ilk 800 karakter) - token tasarrufu
         text_short = text[:800] + "..." if len(text) > 800 else text
+
+        # Kısa abstract'ler diğer makalelerinkilerle tek çağrıda çevrilir
+        if NLP_BATCH_ENABLED and len(text_short) <= NLP_BATCH_ABSTRACT_MAX_CHARS:
+            translation = await _abstract_batcher.submit(text_short)
+            if translation is not None:
+                return translation
         
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        
-        response = client.chat.completions.create(
+        response = await async_client.chat.completions.create(
             model="gpt-3.5-turbo",  # Daha hızlı ve ucuz model
             messages=[
                 {
@@ -35,6 +207,7 @@ async def translate_to_turkish(text: str) -> str:
             temperature=0.2,
             max_tokens=400  # Çıktıyı sınırla
         )
+        _record_usage(response)
         
         translation = response.choices[0].message.content.strip()
         return translation
@@ -43,6 +216,113 @@ async def translate_to_turkish(text: str) -> str:
         raise Exception(f"Çeviri hatası: {str(e)}")
 
 
+# Tam abstract modunda tek çeviri çağrısına giden maksimum parça uzunluğu
+FULL_TEXT_CHUNK_CHARS = 700
+
+# Yapılandırılmış abstract bölüm başlıkları (örn. "BACKGROUND:", "Methods:")
+_SECTION_PATTERN = re.compile(
+    r"(?=\b(?:BACKGROUND|INTRODUCTION|OBJECTIVES?|AIMS?|PURPOSE|METHODS?|MATERIALS AND METHODS|DESIGN|"
+    r"SETTING|PARTICIPANTS|INTERVENTIONS?|MEASUREMENTS|RESULTS?|FINDINGS|DISCUSSION|CONCLUSIONS?|"
+    r"INTERPRETATION|SIGNIFICANCE|CONTEXT|TRIAL REGISTRATION)\s*:)",
+    re.IGNORECASE
+)
+_SENTENCE_PATTERN = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9(\[])")
+
+
+def _pack_sentences(section: str, max_chars: int) -> List[str]:
+    """Bölümü cümle sınırlarından max_chars'ı aşmayan parçalara böl."""
+    chunks = []
+    current = ""
+    for sentence in _SENTENCE_PATTERN.split(section):
+        # Tek cümle sınırı aşıyorsa kelime sınırından böl
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(" ", 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}" if current else sentence
+
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def split_abstract(text: str, max_chars: int = FULL_TEXT_CHUNK_CHARS) -> List[List[str]]:
+    """
+    Uzun abstract'i önce bölüm başlıklarından, sonra cümle sınırlarından böl.
+
+    Returns:
+        Bölüm listesi; her bölüm sırayla birleştirilecek parçalardan oluşur
+    """
+    sections = [section.strip() for section in _SECTION_PATTERN.split(text) if section.strip()]
+    return [_pack_sentences(section, max_chars) for section in sections]
+
+
+# Tam metin parçaları için paylaşılan eşzamanlılık sınırı (OpenAI rate limit'ine takılmamak için)
+_full_text_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _chunk_semaphore() -> asyncio.Semaphore:
+    global _full_text_semaphore
+    if _full_text_semaphore is None:
+        _full_text_semaphore = asyncio.Semaphore(FULL_TEXT_CONCURRENCY)
+    return _full_text_semaphore
+
+
+async def _translate_chunk(chunk: str) -> str:
+    async with _chunk_semaphore():
+        return await _request_chunk_translation(chunk)
+
+
+async def _request_chunk_translation(chunk: str) -> str:
+    response = await async_client.chat.completions.create(
+        model="gpt-3.5-turbo",
+        messages=[
+            {
+                "role": "system",
+                "content": "Tıbbi çevirmen. Metni eksiksiz ve aslına sadık çevir, bölüm başlıklarını koru."
+            },
+            {
+                "role": "user",
+                "content": f"Çevir:\n{chunk}"
+            }
+        ],
+        temperature=0.2,
+        max_tokens=600  # ~700 karakterlik parçanın tam çevirisi için yeterli
+    )
+    _record_usage(response)
+    return response.choices[0].message.content.strip()
+
+
+async def translate_full_text(text: str) -> str:
+    """
+    Abstract'i kısaltmadan Türkçe'ye çevir.
+    Parçalar eşzamanlı çevrilir (tüm istekler genelinde en fazla
+    FULL_TEXT_CONCURRENCY parça) ve orijinal sırayla birleştirilir.
+    """
+    try:
+        sections = split_abstract(text)
+        chunks = [chunk for section in sections for chunk in section]
+        translations = iter(await asyncio.gather(*[_translate_chunk(chunk) for chunk in chunks]))
+
+        # Bölümler arasında paragraf, bölüm içi parçalar arasında boşluk
+        return "\n\n".join(
+            " ".join(next(translations) for _ in section)
+            for section in sections
+        )
+
+    except Exception as e:
+        raise Exception(f"Tam metin çeviri hatası: {str(e)}")
+
+
 async def generate_summary(abstract_en: str, abstract_tr: str) -> str:
     # abstract_en parametresi artık kullanılmıyor (token tasarrufu için)
     """
@@ -52,9 +332,7 @@ async def generate_summary(abstract_en: str, abstract_tr: str) -> str:
         # Sadece ilk 400 karakter kullan - token tasarrufu
         abstract_short = abstract_tr[:400] + "..." if len(abstract_tr) > 400 else abstract_tr
         
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        
-        response = client.chat.completions.create(
+        response = await async_client.chat.completions.create(
             model="gpt-3.5-turbo",  # Daha hızlı model
             messages=[
                 {
@@ -69,6 +347,7 @@ async def generate_summary(abstract_en: str, abstract_tr: str) -> str:
             temperature=0.3,
             max_tokens=150  # Çıktıyı sınırla
         )
+        _record_usage(response)
         
         summary = response.choices[0].message.content.strip()
         return summary
@@ -86,9 +365,7 @@ async def extract_key_takeaways(abstract_en: str, abstract_tr: str, summary_tr:
         # Sadece özeti kullan - token tasarrufu
         input_text = summary_tr[:300] if len(summary_tr) > 300 else summary_tr
         
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        
-        response = client.chat.completions.create(
+        response = await async_client.chat.completions.create(
             model="gpt-3.5-turbo",  # Daha hızlı model
             messages=[
                 {
@@ -103,6 +380,7 @@ async def extract_key_takeaways(abstract_en: str, abstract_tr: str, summary_tr:
             temperature=0.4,
             max_tokens=200  # Çıktıyı sınırla
         )
+        _record_usage(response)
         
         takeaways_text = response.choices[0].message.content.strip()
         
@@ -141,19 +419,36 @@ async def extract_key_takeaways(abstract_en: str, abstract_tr: str, summary_tr:
 async def translate_title(title_en: str) -> str:
     """
     Makale başlığını Türkçe'ye çevir (optimize edilmiş).
+    Daha önce çevrilmiş veya tamamı sözlükle karşılanan başlıklar LLM'e gitmez;
+    diğerlerinde sözlük terimleri prompt'a eklenerek tutarlı çeviri sağlanır.
     """
     try:
+        glossary = get_glossary()
+        title_tr, _ = glossary.fast_translate(title_en)
+        if title_tr is not None:
+            return title_tr
+
         # Başlığı kısalt (100 karakter) - token tasarrufu
         title_short = title_en[:100] if len(title_en) > 100 else title_en
+
+        # Eşzamanlı makalelerin başlıkları tek çağrıda çevrilir
+        if NLP_BATCH_ENABLED:
+            title_tr = await _title_batcher.submit(title_short)
+            if title_tr is not None:
+                glossary.remember(title_en, title_tr)
+                return title_tr
+
+        system_prompt = "Tıbbi başlık çevir. Sadece çeviriyi yaz, kısa tut."
+        terms = glossary.prompt_terms(title_short)
+        if terms:
+            system_prompt += " Terimler: " + "; ".join(f"{en}={tr}" for en, tr in terms)
         
-        client = openai.OpenAI(api_key=OPENAI_API_KEY)
-        
-        response = client.chat.completions.create(
+        response = await async_client.chat.completions.create(
             model="gpt-3.5-turbo",  # Daha hızlı model
             messages=[
                 {
                     "role": "system",
-                    "content": "Tıbbi başlık çevir."
+                    "content": system_prompt
                 },
                 {
                     "role": "user",
@@ -163,10 +458,11 @@ async def translate_title(title_en: str) -> str:
             temperature=0.2,
             max_tokens=100  # Çıktıyı sınırla
         )
+        _record_usage(response)
         
         title_tr = response.choices[0].message.content.strip()
+        glossary.remember(title_en, title_tr)
         return title_tr
     
     except Exception as e:
         raise Exception(f"Başlık çeviri hatası: {str(e)}")
-
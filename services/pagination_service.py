@@ -0,0 +1,242 @@
+"""
+Analiz sonuçları için cursor tabanlı sayfalama servisi.
+Cursor; kaynak başına sayfa konumlarını (arXiv `start`, Europe PMC `cursorMark`,
+DOAJ `page`, Semantic Scholar `offset`) ve daha önce görülen makale kimliklerini
+taşıyan opak bir dizedir.
+"""
+import base64
+import hashlib
+import json
+import zlib
+from typing import List, Dict, Optional, Tuple
+
+import httpx
+
+from services.academic_search_service import (
+    PAGE_FETCHERS,
+    INITIAL_PAGE_POSITIONS,
+    MAX_PAGE_SIZE,
+    fetch_source_page,
+    DEFAULT_SOURCES,
+    PagePosition,
+    SourcePage,
+    article_identifier
+)
+
+CURSOR_VERSION = 1
+
+
+class InvalidCursorError(ValueError):
+    """Cursor çözülemediğinde veya farklı bir sorguya ait olduğunda fırlatılır."""
+
+
+class PageCursor:
+    """
+    Sayfalama durumu.
+
+    positions: kaynak -> [sayfa konumu, o sayfada atlanacak ham kayıt sayısı] veya None (tükendi)
+    seen: daha önce döndürülen makalelerin kısa hash'leri
+    """
+
+    def __init__(
+        self,
+        query_hash: str,
+        page_size: int,
+        positions: Dict[str, Optional[List]],
+        seen: Optional[List[str]] = None
+    ):
+        self.query_hash = query_hash
+        self.page_size = page_size
+        self.positions = positions
+        self.seen = set(seen or [])
+
+    @property
+    def exhausted(self) -> bool:
+        return all(position is None for position in self.positions.values())
+
+    def encode(self) -> str:
+        payload = {
+            "v": CURSOR_VERSION,
+            "q": self.query_hash,
+            "n": self.page_size,
+            "p": self.positions,
+            "s": sorted(self.seen)
+        }
+        raw = zlib.compress(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    @classmethod
+    def decode(cls, cursor: str) -> "PageCursor":
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(zlib.decompress(base64.urlsafe_b64decode(padded)))
+            if payload.get("v") != CURSOR_VERSION:
+                raise InvalidCursorError("Desteklenmeyen cursor sürümü")
+            _validate_payload(payload)
+            return cls(payload["q"], payload["n"], payload["p"], payload.get("s", []))
+        except InvalidCursorError:
+            raise
+        except Exception as e:
+            raise InvalidCursorError(f"Geçersiz cursor: {str(e)}")
+
+
+def _validate_payload(payload: Dict) -> None:
+    """Çözülen cursor'ın alan tiplerini doğrula (elle değiştirilmiş cursor'lar 500 vermesin)."""
+    page_size = payload.get("n")
+    if not isinstance(page_size, int) or isinstance(page_size, bool) or not 1 <= page_size <= MAX_PAGE_SIZE:
+        raise InvalidCursorError("Geçersiz cursor: sayfa boyutu hatalı")
+    if not isinstance(payload.get("q"), str):
+        raise InvalidCursorError("Geçersiz cursor: sorgu hash'i hatalı")
+
+    positions = payload.get("p")
+    if not isinstance(positions, dict):
+        raise InvalidCursorError("Geçersiz cursor: kaynak konumları hatalı")
+    for source, position in positions.items():
+        if position is None:
+            continue
+        valid = (
+            isinstance(position, list)
+            and len(position) == 2
+            and isinstance(position[0], (int, str))
+            and isinstance(position[1], int)
+            and position[1] >= 0
+        )
+        if not valid:
+            raise InvalidCursorError(f"Geçersiz cursor: {source} konumu hatalı")
+
+    seen = payload.get("s", [])
+    if not isinstance(seen, list) or not all(isinstance(item, str) for item in seen):
+        raise InvalidCursorError("Geçersiz cursor: görülen makale listesi hatalı")
+
+
+def query_hash(keyword: str, time_range_years: Optional[int]) -> str:
+    """Cursor'ın ait olduğu sorguyu doğrulamak için kısa hash."""
+    normalized = " ".join(keyword.lower().split())
+    return hashlib.sha1(f"{normalized}|{time_range_years}".encode("utf-8")).hexdigest()[:12]
+
+
+def identifier_hash(identifier: str) -> str:
+    """Görülen makale kimliklerini cursor'da kompakt tutmak için kısa hash."""
+    return hashlib.sha1(identifier.encode("utf-8")).hexdigest()[:10]
+
+
+def new_cursor(
+    keyword: str,
+    page_size: int,
+    time_range_years: Optional[int] = None,
+    sources: Optional[List[str]] = None
+) -> PageCursor:
+    """Sorgu için ilk sayfa cursor'ı oluştur."""
+    positions = {
+        source: [INITIAL_PAGE_POSITIONS[source], 0]
+        for source in (sources or DEFAULT_SOURCES)
+    }
+    return PageCursor(query_hash(keyword, time_range_years), page_size, positions)
+
+
+def resolve_cursor(
+    cursor: Optional[str],
+    keyword: str,
+    page_size: int,
+    time_range_years: Optional[int] = None
+) -> PageCursor:
+    """İstekteki cursor'ı çöz; yoksa ilk sayfa cursor'ını döndür."""
+    if not cursor:
+        return new_cursor(keyword, page_size, time_range_years)
+
+    page_cursor = PageCursor.decode(cursor)
+    if page_cursor.query_hash != query_hash(keyword, time_range_years):
+        raise InvalidCursorError("Cursor farklı bir sorguya ait")
+    unknown_sources = [source for source in page_cursor.positions if source not in PAGE_FETCHERS]
+    if unknown_sources:
+        raise InvalidCursorError(f"Bilinmeyen kaynak: {', '.join(unknown_sources)}")
+    return page_cursor
+
+
+async def _fetch_source_page(
+    client: httpx.AsyncClient,
+    source: str,
+    keyword: str,
+    page_size: int,
+    time_range_years: Optional[int],
+    position: PagePosition
+) -> Optional[SourcePage]:
+    try:
+        return await fetch_source_page(client, source, keyword, page_size, time_range_years, position)
+    except Exception as e:
+        # Hatalı kaynak bu sayfada atlanır, konumu değişmez (sonraki sayfada tekrar denenir)
+        print(f"{source} sayfa çekme hatası: {str(e)}")
+        return None
+
+
+async def search_all_sources_page(
+    keyword: str,
+    article_count: int,
+    time_range_years: Optional[int] = None,
+    cursor: Optional[PageCursor] = None
+) -> Tuple[List[Dict], PageCursor]:
+    """
+    Cursor'daki konumlardan itibaren kaynakları öncelik sırasıyla, sayfa dolana kadar çek.
+    Sadece daha önce görülmemiş makaleler döner; kısmen tüketilen kaynak
+    sayfaları bir sonraki istekte kaldığı yerden devam eder.
+
+    Args:
+        keyword: Aranacak anahtar kelime
+        article_count: Sayfa başına makale sayısı
+        time_range_years: Son N yıl içindeki makaleler
+        cursor: Önceki sayfanın cursor'ı (None ise ilk sayfa)
+
+    Returns:
+        (yeni makaleler, sonraki cursor)
+    """
+    if cursor is None:
+        cursor = new_cursor(keyword, article_count, time_range_years)
+
+    # Kısmi sayfa devamı için sayfa boyutu cursor boyunca sabit kalmalı
+    page_size = cursor.page_size
+    active_sources = [source for source, position in cursor.positions.items() if position is not None]
+
+    next_positions = dict(cursor.positions)
+    seen = set(cursor.seen)
+    articles = []
+
+    # Kaynaklar öncelik sırasıyla çekilir; sayfa dolduysa alt öncelikli
+    # kaynaklara istek atılmaz (konumları değişmeden bir sonraki sayfaya kalır)
+    async with httpx.AsyncClient(timeout=30.0) as client:
+        for source in active_sources:
+            if len(articles) >= article_count:
+                break
+
+            position, skip = cursor.positions[source]
+            page = await _fetch_source_page(client, source, keyword, page_size, time_range_years, position)
+            if page is None:
+                continue
+
+            last_consumed = skip - 1
+            page_filled = False
+
+            for raw_index, article in page.entries:
+                if raw_index < skip:
+                    continue
+                if len(articles) >= article_count:
+                    page_filled = True
+                    break
+                last_consumed = raw_index
+
+                identifier = article_identifier(article)
+                key = identifier_hash(identifier) if identifier else None
+                if key and key in seen:
+                    continue
+                if key:
+                    seen.add(key)
+                articles.append(article)
+
+            if page_filled:
+                # Sayfanın kalanı bir sonraki istekte işlenecek
+                next_positions[source] = [position, last_consumed + 1]
+            elif page.next_position is not None:
+                next_positions[source] = [page.next_position, 0]
+            else:
+                next_positions[source] = None
+
+    return articles, PageCursor(cursor.query_hash, page_size, next_positions, list(seen))
@@ -0,0 +1,189 @@
+"""
+Popüler anahtar kelimeler için arka plan ön ısıtma (prefetch) servisi.
+Gelen isteklerden anahtar kelime frekansını takip eder ve yoğun olmayan
+saatlerde en popüler sorguları önceden işleyip cache'e yazar.
+"""
+import asyncio
+import time
+from collections import OrderedDict
+from datetime import datetime
+from typing import List, Dict, Optional, Tuple
+
+from config import (
+    PREFETCH_INTERVAL_SECONDS,
+    PREFETCH_TOP_N,
+    PREFETCH_LLM_BUDGET,
+    PREFETCH_OFFPEAK_START_HOUR,
+    PREFETCH_OFFPEAK_END_HOUR,
+    PREFETCH_MAX_TRACKED_KEYWORDS,
+    PREFETCH_KEYWORD_HALF_LIFE_SECONDS,
+    RESULT_CACHE_TTL_SECONDS,
+    RESULT_CACHE_MAX_ENTRIES
+)
+from models.schemas import AnalyzeArticlesRequest, ArticleResponse
+from services.academic_search_service import stream_all_sources
+from services.analysis_service import analyze_article_stream, LLM_CALLS_PER_ARTICLE
+
+# Cache anahtarı: (normalize anahtar kelime, time_range_years, full_abstract)
+CacheKey = Tuple[str, Optional[int], bool]
+
+# Anahtar -> (zamanla azalan popülerlik skoru, son güncelleme zamanı)
+_keyword_scores: Dict[CacheKey, Tuple[float, float]] = {}
+# Aynı anahtar için istenen en büyük article_count
+_keyword_article_counts: Dict[CacheKey, int] = {}
+# Anahtar -> (kayıt zamanı, article_count, sonuçlar); en son kullanılan sonda (LRU)
+_result_cache: "OrderedDict[CacheKey, Tuple[float, int, List[ArticleResponse]]]" = OrderedDict()
+
+
+def normalize_keyword(keyword: str) -> str:
+    """Anahtar kelimeyi karşılaştırma için normalize et (küçük harf, tek boşluk)."""
+    return " ".join(keyword.lower().split())
+
+
+def _cache_key(keyword: str, time_range_years: Optional[int], full_abstract: bool = False) -> CacheKey:
+    return normalize_keyword(keyword), time_range_years, full_abstract
+
+
+def _decayed_score(key: CacheKey, now: float) -> float:
+    """Anahtarın şu anki skoru; her istek 1 puan ekler ve puanlar yarılanma süresiyle azalır."""
+    score, updated_at = _keyword_scores.get(key, (0.0, now))
+    return score * 0.5 ** ((now - updated_at) / PREFETCH_KEYWORD_HALF_LIFE_SECONDS)
+
+
+def trending_keywords(limit: int, now: Optional[float] = None) -> List[Tuple[CacheKey, float]]:
+    """Son dönemde en çok istenen anahtarlar (azalan skora göre)."""
+    now = now or time.time()
+    scores = [(key, _decayed_score(key, now)) for key in _keyword_scores]
+    return sorted(scores, key=lambda item: item[1], reverse=True)[:limit]
+
+
+def record_request(request: AnalyzeArticlesRequest) -> None:
+    """Gelen isteğin anahtar kelimesini popülerlik tablosuna ekle."""
+    now = time.time()
+    key = _cache_key(request.keyword, request.time_range_years, request.full_abstract)
+    _keyword_scores[key] = (_decayed_score(key, now) + 1, now)
+    _keyword_article_counts[key] = max(_keyword_article_counts.get(key, 0), request.article_count)
+
+    # Tablo büyürse sadece güncel skoru en yüksek yarıyı tut
+    if len(_keyword_scores) > PREFETCH_MAX_TRACKED_KEYWORDS:
+        keep = {key for key, _ in trending_keywords(PREFETCH_MAX_TRACKED_KEYWORDS // 2, now)}
+        for stale_key in [k for k in _keyword_scores if k not in keep]:
+            del _keyword_scores[stale_key]
+            _keyword_article_counts.pop(stale_key, None)
+
+
+def get_cached_results(request: AnalyzeArticlesRequest) -> Optional[List[ArticleResponse]]:
+    """
+    İstek için taze cache sonucu varsa döndür.
+    Daha büyük article_count ile hesaplanmış sonuçlar da kullanılabilir.
+    """
+    key = _cache_key(request.keyword, request.time_range_years, request.full_abstract)
+    entry = _result_cache.get(key)
+    if entry is None:
+        return None
+
+    stored_at, article_count, results = entry
+    if time.time() - stored_at > RESULT_CACHE_TTL_SECONDS:
+        del _result_cache[key]
+        return None
+    if article_count < request.article_count:
+        return None
+
+    _result_cache.move_to_end(key)
+    return results[:request.article_count]
+
+
+def store_results(
+    keyword: str,
+    time_range_years: Optional[int],
+    article_count: int,
+    results: List[ArticleResponse],
+    full_abstract: bool = False
+) -> None:
+    """Analiz sonuçlarını cache'e yaz (mevcut daha büyük kayıtları ezmeden)."""
+    key = _cache_key(keyword, time_range_years, full_abstract)
+    entry = _result_cache.get(key)
+    if entry is not None:
+        stored_at, cached_count, _ = entry
+        is_fresh = time.time() - stored_at <= RESULT_CACHE_TTL_SECONDS
+        if is_fresh and cached_count > article_count:
+            return
+    _result_cache[key] = (time.time(), article_count, results)
+    _result_cache.move_to_end(key)
+
+    # Sınır aşılırsa en uzun süredir kullanılmayan sorguları at
+    while len(_result_cache) > RESULT_CACHE_MAX_ENTRIES:
+        _result_cache.popitem(last=False)
+
+
+def is_off_peak(now: Optional[datetime] = None) -> bool:
+    """Şu anki saat yoğun olmayan pencere içinde mi (gece yarısını aşan pencereler desteklenir)."""
+    hour = (now or datetime.now()).hour
+    start, end = PREFETCH_OFFPEAK_START_HOUR, PREFETCH_OFFPEAK_END_HOUR
+    if start <= end:
+        return start <= hour < end
+    return hour >= start or hour < end
+
+
+def _needs_refresh(key: CacheKey, article_count: int) -> bool:
+    entry = _result_cache.get(key)
+    if entry is None:
+        return True
+    stored_at, cached_count, _ = entry
+    # TTL'nin yarısı geçtiyse sıcak tutmak için yenile
+    return cached_count < article_count or time.time() - stored_at > RESULT_CACHE_TTL_SECONDS / 2
+
+
+async def run_prefetch_cycle(llm_budget: int = PREFETCH_LLM_BUDGET) -> int:
+    """
+    En popüler anahtar kelimeleri LLM bütçesi içinde yeniden işle.
+
+    Returns:
+        Isıtılan anahtar kelime sayısı
+    """
+    warmed = 0
+    remaining_budget = llm_budget
+
+    for key, _ in trending_keywords(PREFETCH_TOP_N):
+        article_count = _keyword_article_counts.get(key, 10)
+        if not _needs_refresh(key, article_count):
+            continue
+
+        # En kötü durum maliyeti bütçeyi aşıyorsa bu anahtarı atla
+        estimated_calls = article_count * LLM_CALLS_PER_ARTICLE
+        if estimated_calls > remaining_budget:
+            continue
+
+        keyword, time_range_years, full_abstract = key
+        found_count = 0
+
+        async def articles_stream():
+            nonlocal found_count
+            async for article in stream_all_sources(keyword, article_count, time_range_years):
+                found_count += 1
+                yield article
+
+        try:
+            results = await analyze_article_stream(articles_stream(), full_abstract)
+            remaining_budget -= found_count * LLM_CALLS_PER_ARTICLE
+            if results:
+                store_results(keyword, time_range_years, article_count, results, full_abstract)
+                warmed += 1
+        except Exception as e:
+            print(f"Uyarı: Ön ısıtma başarısız oldu ({keyword}): {str(e)}")
+
+    return warmed
+
+
+async def prefetch_loop() -> None:
+    """Lifespan boyunca çalışan zamanlayıcı; sadece yoğun olmayan saatlerde ısıtır."""
+    while True:
+        await asyncio.sleep(PREFETCH_INTERVAL_SECONDS)
+        if not is_off_peak():
+            continue
+        try:
+            warmed = await run_prefetch_cycle()
+            if warmed:
+                print(f"Ön ısıtma tamamlandı: {warmed} anahtar kelime")
+        except Exception as e:
+            print(f"Uyarı: Ön ısıtma döngüsü hatası: {str(e)}")
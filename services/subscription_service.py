@@ -0,0 +1,245 @@
+"""
+Kayıtlı arama (abonelik) servisi.
+Her kayıtlı arama için bir yüksek su işareti (son yayın tarihi + görülen
+makale kimlikleri) tutar; zamanlanmış çalıştırmalar sadece bu işaretten
+sonraki makaleleri arar ve yalnızca yeni makaleleri NLP hattından geçirir.
+"""
+import asyncio
+import json
+import os
+import uuid
+from datetime import datetime
+from typing import List, Dict, Optional
+
+from config import (
+    SAVED_SEARCHES_PATH,
+    SAVED_SEARCH_CHECK_INTERVAL_SECONDS,
+    SAVED_SEARCH_RUN_EVERY_SECONDS,
+    SAVED_SEARCH_FEED_LIMIT,
+    SAVED_SEARCH_MAX_SEEN_IDS
+)
+from models.schemas import (
+    ArticleResponse,
+    SavedSearchCreate,
+    SavedSearch,
+    FeedItem,
+    SavedSearchFeed
+)
+from services.academic_search_service import stream_all_sources, article_identifier
+from services.analysis_service import analyze_article_stream
+from services.pagination_service import identifier_hash
+
+# ID -> kayıt (ilk erişimde dosyadan yüklenir)
+_saved_searches: Optional[Dict[str, Dict]] = None
+_store_lock: Optional[asyncio.Lock] = None
+# Şu an çalışmakta olan arama ID'leri (aynı aramanın eşzamanlı çalışmasını önler)
+_running: set = set()
+
+
+def _now_iso() -> str:
+    return datetime.now().isoformat(timespec="seconds")
+
+
+def _read_store() -> Dict[str, Dict]:
+    if not os.path.exists(SAVED_SEARCHES_PATH):
+        return {}
+    with open(SAVED_SEARCHES_PATH, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_store(data: Dict[str, Dict]) -> None:
+    # Yarım yazılmış dosya kalmaması için geçici dosya + atomik yer değiştirme
+    os.makedirs(os.path.dirname(SAVED_SEARCHES_PATH) or ".", exist_ok=True)
+    tmp_path = f"{SAVED_SEARCHES_PATH}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
+    os.replace(tmp_path, SAVED_SEARCHES_PATH)
+
+
+def _lock() -> asyncio.Lock:
+    global _store_lock
+    if _store_lock is None:
+        _store_lock = asyncio.Lock()
+    return _store_lock
+
+
+async def _store() -> Dict[str, Dict]:
+    global _saved_searches
+    if _saved_searches is None:
+        loop = asyncio.get_running_loop()
+        _saved_searches = await loop.run_in_executor(None, _read_store)
+    return _saved_searches
+
+
+async def _persist() -> None:
+    # Dosya yazımı event loop'u bloke etmesin
+    snapshot = json.loads(json.dumps(await _store()))
+    loop = asyncio.get_running_loop()
+    await loop.run_in_executor(None, _write_store, snapshot)
+
+
+def _to_model(record: Dict) -> SavedSearch:
+    return SavedSearch(
+        id=record["id"],
+        keyword=record["keyword"],
+        article_count=record["article_count"],
+        time_range_years=record.get("time_range_years"),
+        created_at=record["created_at"],
+        last_run_at=record.get("last_run_at"),
+        last_publication_date=record.get("last_publication_date"),
+        seen_count=len(record.get("seen_ids", []))
+    )
+
+
+async def create_saved_search(data: SavedSearchCreate) -> SavedSearch:
+    """Yeni kayıtlı arama oluştur (ilk çalıştırma zamanlayıcıya veya /run'a bırakılır)."""
+    record = {
+        "id": uuid.uuid4().hex[:12],
+        "keyword": data.keyword,
+        "article_count": data.article_count,
+        "time_range_years": data.time_range_years,
+        "created_at": _now_iso(),
+        "last_run_at": None,
+        "last_publication_date": None,
+        "seen_ids": [],
+        "feed": []
+    }
+    async with _lock():
+        (await _store())[record["id"]] = record
+        await _persist()
+    return _to_model(record)
+
+
+async def list_saved_searches() -> List[SavedSearch]:
+    return [_to_model(record) for record in (await _store()).values()]
+
+
+async def get_saved_search(search_id: str) -> Optional[SavedSearch]:
+    record = (await _store()).get(search_id)
+    return _to_model(record) if record is not None else None
+
+
+async def delete_saved_search(search_id: str) -> bool:
+    async with _lock():
+        store = await _store()
+        if search_id not in store:
+            return False
+        del store[search_id]
+        await _persist()
+    return True
+
+
+async def get_feed(search_id: str, limit: int = 50) -> Optional[SavedSearchFeed]:
+    """Kayıtlı aramanın akışını en yeni önce döndür."""
+    record = (await _store()).get(search_id)
+    if record is None:
+        return None
+    return SavedSearchFeed(
+        saved_search=_to_model(record),
+        items=[FeedItem(**item) for item in record.get("feed", [])[:limit]]
+    )
+
+
+def _response_identifier(article: ArticleResponse) -> Optional[str]:
+    # article_identifier ile aynı öncelik: DOI, URL, kaynak ID'si
+    return article.doi or article.pubmed_url or article.pmid
+
+
+async def run_saved_search(search_id: str) -> Optional[List[ArticleResponse]]:
+    """
+    Kayıtlı aramayı yüksek su işaretinden itibaren çalıştır.
+
+    Returns:
+        Yeni işlenen makaleler (arama yoksa None)
+    """
+    record = (await _store()).get(search_id)
+    if record is None:
+        return None
+    if search_id in _running:
+        return []
+
+    _running.add(search_id)
+    try:
+        seen = set(record.get("seen_ids", []))
+        since = record.get("last_publication_date")
+
+        def already_seen(article: Dict) -> bool:
+            identifier = article_identifier(article)
+            return bool(identifier) and identifier_hash(identifier) in seen
+
+        # Görülen makaleler akış içinde atlanır; article_count sadece yenilerle dolar.
+        # Atlanacak kayıtlar kadar fazladan taranır.
+        articles = stream_all_sources(
+            keyword=record["keyword"],
+            article_count=record["article_count"],
+            time_range_years=record.get("time_range_years"),
+            since=since,
+            exclude=already_seen,
+            scan_limit=record["article_count"] + len(seen)
+        )
+
+        processed = await analyze_article_stream(articles)
+
+        async with _lock():
+            # Çalışma sırasında silinmiş olabilir
+            if search_id not in await _store():
+                return processed
+
+            found_at = _now_iso()
+            today = datetime.now().strftime("%Y-%m-%d")
+            seen_ids = record.get("seen_ids", [])
+            last_date = record.get("last_publication_date")
+            for article in processed:
+                identifier = _response_identifier(article)
+                if identifier:
+                    seen_ids.append(identifier_hash(identifier))
+                # Gelecek tarihli kayıtlar işareti ileri atmasın
+                publication_date = (article.publication_date or "")[:10]
+                if publication_date and publication_date <= today and (not last_date or publication_date > last_date):
+                    last_date = publication_date
+
+            new_items = [{"found_at": found_at, "article": article.model_dump()} for article in processed]
+            record["feed"] = (new_items + record.get("feed", []))[:SAVED_SEARCH_FEED_LIMIT]
+            record["seen_ids"] = seen_ids[-SAVED_SEARCH_MAX_SEEN_IDS:]
+            record["last_publication_date"] = last_date
+            record["last_run_at"] = found_at
+            await _persist()
+
+        return processed
+    finally:
+        _running.discard(search_id)
+
+
+def _is_due(record: Dict, now: datetime) -> bool:
+    last_run_at = record.get("last_run_at")
+    if not last_run_at:
+        return True
+    elapsed = (now - datetime.fromisoformat(last_run_at)).total_seconds()
+    return elapsed >= SAVED_SEARCH_RUN_EVERY_SECONDS
+
+
+async def run_due_saved_searches() -> int:
+    """Zamanı gelmiş tüm kayıtlı aramaları sırayla çalıştır; yeni makale sayısını döndür."""
+    now = datetime.now()
+    due_ids = [search_id for search_id, record in (await _store()).items() if _is_due(record, now)]
+
+    new_count = 0
+    for search_id in due_ids:
+        try:
+            processed = await run_saved_search(search_id)
+            new_count += len(processed or [])
+        except Exception as e:
+            print(f"Uyarı: Kayıtlı arama çalıştırılamadı ({search_id}): {str(e)}")
+    return new_count
+
+
+async def saved_search_loop() -> None:
+    """Lifespan boyunca çalışan kayıtlı arama zamanlayıcısı."""
+    while True:
+        try:
+            new_count = await run_due_saved_searches()
+            if new_count:
+                print(f"Kayıtlı aramalar çalıştırıldı: {new_count} yeni makale")
+        except Exception as e:
+            print(f"Uyarı: Kayıtlı arama döngüsü hatası: {str(e)}")
+        await asyncio.sleep(SAVED_SEARCH_CHECK_INTERVAL_SECONDS)